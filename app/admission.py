@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Admission control for expensive endpoints.
+
+Counts in-flight requests against a limit guarded by an asyncio.Condition, so
+the limit can be changed at runtime without touching semaphore internals.
+Controllers are created lazily on first use so they bind to the running loop.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class AdmissionController:
+    """Counter-based admission limit usable as `async with controller:`."""
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._active = 0
+        self._cond = asyncio.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    def locked(self) -> bool:
+        """True when no slot is free (same meaning as Semaphore.locked())."""
+        return self._active >= self._limit
+
+    async def acquire(self, timeout: Optional[float] = None):
+        """
+        Wait for a free slot and take it.
+
+        Args:
+            timeout: Seconds to wait for a slot (None waits indefinitely)
+
+        Raises:
+            asyncio.TimeoutError: If no slot freed up within timeout
+        """
+        async with self._cond:
+            await asyncio.wait_for(self._cond.wait_for(lambda: self._active < self._limit), timeout)
+            self._active += 1
+
+    async def release(self):
+        """Give a slot back and wake one waiter."""
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+
+    async def set_limit(self, limit: int):
+        """
+        Change the limit; waiters re-check immediately.
+
+        Lowering the limit never interrupts running requests, it only holds
+        back new ones until the active count drops below it.
+        """
+        async with self._cond:
+            logger.info(f"🚦 Admission limit changed: {self._limit} -> {limit}")
+            self._limit = limit
+            self._cond.notify_all()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limit and current usage."""
+        return {
+            "limit": self._limit,
+            "active": self._active,
+            "saturated": self.locked()
+        }
+
+# Global admission controllers
+_controllers: Dict[str, AdmissionController] = {}
+
+def get_admission_controller(name: str, limit: int) -> AdmissionController:
+    """Get or create the admission controller for name (limit only applies on creation)."""
+    if name not in _controllers:
+        _controllers[name] = AdmissionController(limit)
+    return _controllers[name]
@@ -8,16 +8,23 @@ Enhanced with transcript data for richer, more accurate scene descriptions
 import os
 import base64
 import json
+import logging
 import asyncio
 from typing import List, Dict, Optional
-from openai import AsyncOpenAI
 import aiofiles
 from dotenv import load_dotenv
 from app.ai_rate_limiter import get_rate_limiter, RateLimitType
+from app.db_connections import get_shared_openai_client
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Frame types kept for AI analysis and fallback tags used when analysis fails
+KEY_FRAME_TYPES = frozenset({"start", "valley", "peak", "end"})
+DEFAULT_FITNESS_TAGS = ("exercise", "movement", "mobility", "fitness", "training")
+
 # Initialize clients (will be set when needed)
 openai_client = None
 gemini_client = None
@@ -36,13 +43,12 @@ if AI_PROVIDER == "gemini":
         AI_PROVIDER = "openai"  # Fall back to OpenAI
 
 def get_openai_client():
-    """Get OpenAI client, initializing if needed."""
+    """Get OpenAI client, initializing if needed (shares the app-wide connection pool)."""
     global openai_client
     if openai_client is None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
+        openai_client = get_shared_openai_client()
+        if openai_client is None:
             raise ValueError("OpenAI API key not found. Set OPENAI_API_KEY environment variable.")
-        openai_client = AsyncOpenAI(api_key=api_key)
     return openai_client
 
 def get_gemini_client():
@@ -64,7 +70,7 @@ async def encode_image_to_base64(image_path: str) -> str:
             image_data = await image_file.read()
             return base64.b64encode(image_data).decode('utf-8')
     except Exception as e:
-        print(f"Error encoding image {image_path}: {e}")
+        logger.warning("Error encoding image %s: %s", image_path, e)
         return ""
 
 def find_relevant_transcript_segments(transcript_data: List[Dict], start_time: float, end_time: float) -> str:
@@ -204,7 +210,7 @@ async def analyze_scene_with_gemini(extreme_frames: List[Dict], scene_index: int
     """
     
     # Filter to only the key extreme frames (start, valley, peak, end)
-    key_frames = [f for f in extreme_frames if f['frame_type'] in ['start', 'valley', 'peak', 'end']]
+    key_frames = [f for f in extreme_frames if f['frame_type'] in KEY_FRAME_TYPES]
     
     if not key_frames:
         return {
@@ -224,7 +230,7 @@ async def analyze_scene_with_gemini(extreme_frames: List[Dict], scene_index: int
         scene_transcript = find_relevant_transcript_segments(transcript_data, start_time, end_time)
     
     transcript_context = f" (transcript available)" if scene_transcript else " (no transcript)"
-    print(f"🤖 Analyzing scene {scene_index + 1} with {len(key_frames)} key frames using Gemini{transcript_context}...")
+    logger.info("🤖 Analyzing scene %d with %d key frames using Gemini%s...", scene_index + 1, len(key_frames), transcript_context)
     
     try:
         # Get Gemini client
@@ -242,7 +248,7 @@ async def analyze_scene_with_gemini(extreme_frames: List[Dict], scene_index: int
                         "data": image_data
                     })
             except Exception as e:
-                print(f"Error reading image {frame['frame_path']}: {e}")
+                logger.warning("Error reading image %s: %s", frame['frame_path'], e)
                 continue
         
         if not image_parts:
@@ -369,7 +375,7 @@ Respond in JSON format:
             }
             
     except Exception as e:
-        print(f"Error in Gemini analysis for scene {scene_index}: {e}")
+        logger.exception("Error in Gemini analysis for scene %s", scene_index)
         return {
             "scene_index": scene_index,
             "start_time": start_time,
@@ -401,7 +407,7 @@ async def analyze_scene_with_gpt4_vision(extreme_frames: List[Dict], scene_index
     """
     
     # Filter to only the key extreme frames (start, valley, peak, end)
-    key_frames = [f for f in extreme_frames if f['frame_type'] in ['start', 'valley', 'peak', 'end']]
+    key_frames = [f for f in extreme_frames if f['frame_type'] in KEY_FRAME_TYPES]
     
     if not key_frames:
         return {
@@ -419,7 +425,7 @@ async def analyze_scene_with_gpt4_vision(extreme_frames: List[Dict], scene_index
         scene_transcript = find_relevant_transcript_segments(transcript_data, start_time, end_time)
     
     transcript_context = f" (transcript available)" if scene_transcript else " (no transcript)"
-    print(f"🤖 Analyzing scene {scene_index + 1} with {len(key_frames)} key frames{transcript_context}...")
+    logger.info("🤖 Analyzing scene %d with %d key frames%s...", scene_index + 1, len(key_frames), transcript_context)
     
     try:
         # Encode all key frames to base64
@@ -586,7 +592,7 @@ Respond in this exact JSON format:
                     "start_time": start_time,
                     "end_time": end_time,
                     "description": description or "Movement analysis completed",
-                    "tags": tags[:5] if tags else ["exercise", "movement", "mobility", "fitness", "training"],
+                    "tags": tags[:5] if tags else list(DEFAULT_FITNESS_TAGS),
                     "analysis_success": True,
                     "has_transcript": bool(scene_transcript),
                     "scene_transcript": scene_transcript if scene_transcript else None,
@@ -594,15 +600,15 @@ Respond in this exact JSON format:
                 }
                 
         except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}")
-            print(f"Raw response: {response_text}")
+            logger.warning("JSON decode error: %s", e)
+            logger.debug("Raw response: %s", response_text)
             
             return {
                 "scene_index": scene_index,
                 "start_time": start_time,
                 "end_time": end_time,
                 "description": "AI analysis completed but format parsing failed",
-                "tags": ["exercise", "movement", "mobility", "fitness", "training"],
+                "tags": list(DEFAULT_FITNESS_TAGS),
                 "analysis_success": False,
                 "has_transcript": bool(scene_transcript),
                 "scene_transcript": scene_transcript if scene_transcript else None,
@@ -610,7 +616,7 @@ Respond in this exact JSON format:
             }
             
     except Exception as e:
-        print(f"Error in GPT-4 Vision analysis: {e}")
+        logger.exception("Error in GPT-4 Vision analysis")
         return {
             "scene_index": scene_index,
             "start_time": start_time,
@@ -669,14 +675,16 @@ async def analyze_all_scenes_with_ai(scenes_data: List[Dict], transcript_data: O
     video_context_status = f" with video context" if existing_scenes else ""
     context_info = f"{transcript_status}{video_context_status}" if transcript_status or video_context_status else " (visual only)"
     
-    print(f"🧠 Starting AI analysis of {len(scenes_data)} scenes{context_info}...")
+    logger.info("🧠 Starting AI analysis of %d scenes%s...", len(scenes_data), context_info)
     
     # Create video-level context from existing scenes and transcript
     video_context = None
     if existing_scenes or transcript_data:
         video_context = create_video_context_from_scenes(existing_scenes or [], transcript_data)
         if video_context:
-            print(f"📚 Created video context from {len(existing_scenes) if existing_scenes else 0} existing scenes and {'transcript' if transcript_data else 'no transcript'}")
+            logger.info("📚 Created video context from %d existing scenes and %s",
+                        len(existing_scenes) if existing_scenes else 0,
+                        'transcript' if transcript_data else 'no transcript')
     
     # Analyze scenes concurrently (but limit concurrency to avoid API limits)
     semaphore = asyncio.Semaphore(3)  # Max 3 concurrent API calls
@@ -711,12 +719,12 @@ async def analyze_all_scenes_with_ai(scenes_data: List[Dict], transcript_data: O
     transcript_count = sum(1 for scene in analyzed_scenes if scene.get('has_transcript', False))
     video_context_count = sum(1 for scene in analyzed_scenes if scene.get('has_video_context', False))
     
-    print(f"✅ Completed AI analysis of {len(analyzed_scenes)} scenes")
-    print(f"   📈 Success rate: {success_count}/{len(analyzed_scenes)} scenes")
+    logger.info("✅ Completed AI analysis of %d scenes", len(analyzed_scenes))
+    logger.info("   📈 Success rate: %d/%d scenes", success_count, len(analyzed_scenes))
     if transcript_data:
-        print(f"   📝 Transcript context: {transcript_count}/{len(analyzed_scenes)} scenes")
+        logger.info("   📝 Transcript context: %d/%d scenes", transcript_count, len(analyzed_scenes))
     if video_context:
-        print(f"   🎬 Video context: {video_context_count}/{len(analyzed_scenes)} scenes")
+        logger.info("   🎬 Video context: %d/%d scenes", video_context_count, len(analyzed_scenes))
     
     return analyzed_scenes
 
@@ -727,7 +735,7 @@ async def cleanup_frame_images(scenes_data: List[Dict]) -> None:
     Args:
         scenes_data: List of scene dictionaries containing frame paths
     """
-    print("🧹 Cleaning up frame images...")
+    logger.info("🧹 Cleaning up frame images...")
     
     deleted_count = 0
     error_count = 0
@@ -740,12 +748,12 @@ async def cleanup_frame_images(scenes_data: List[Dict]) -> None:
                     os.remove(frame_path)
                     deleted_count += 1
                 except Exception as e:
-                    print(f"Error deleting {frame_path}: {e}")
+                    logger.warning("Error deleting %s: %s", frame_path, e)
                     error_count += 1
     
-    print(f"🗑️  Deleted {deleted_count} frame images")
+    logger.info("🗑️  Deleted %d frame images", deleted_count)
     if error_count > 0:
-        print(f"⚠️  Failed to delete {error_count} files")
+        logger.warning("⚠️  Failed to delete %d files", error_count)
     
     # Try to remove empty directories
     try:
@@ -756,9 +764,9 @@ async def cleanup_frame_images(scenes_data: List[Dict]) -> None:
                 frames_dir = os.path.dirname(first_frame_path)
                 if os.path.exists(frames_dir) and not os.listdir(frames_dir):
                     os.rmdir(frames_dir)
-                    print(f"🗂️  Removed empty frames directory: {frames_dir}")
+                    logger.info("🗂️  Removed empty frames directory: %s", frames_dir)
     except Exception as e:
-        print(f"Note: Could not remove frames directory: {e}")
+        logger.warning("Could not remove frames directory: %s", e)
 
 # Main function for testing
 async def test_ai_analysis():
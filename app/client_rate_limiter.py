@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Per-client request rate limiting for public endpoints.
+
+Each client address gets a token bucket holding up to `per_minute` requests
+that refills continuously, so short bursts are allowed but sustained traffic
+is capped before any work is admitted. State is in-process, like the
+admission controllers, and bounded: buckets are kept in least recently
+seen order so idle ones are dropped from the front, and the least recently
+seen client is evicted once MAX_TRACKED_CLIENTS are tracked.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+# Buckets idle for this long are full again and can be forgotten
+BUCKET_IDLE_SECONDS = 60.0
+MAX_TRACKED_CLIENTS = 10000
+
+class ClientRateLimiter:
+    """Token bucket per client key."""
+
+    def __init__(self, name: str, per_minute: int):
+        self.name = name
+        self.per_minute = per_minute
+        self._refill_per_second = per_minute / 60.0
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._rejected = 0
+
+    def check(self, client: str) -> float:
+        """
+        Take one request token for client.
+
+        Args:
+            client: Client key (usually the remote address)
+
+        Returns:
+            0 if the request may proceed, otherwise seconds until a token is available
+        """
+        now = time.monotonic()
+        tokens, last = self._buckets.get(client, (float(self.per_minute), now))
+        tokens = min(float(self.per_minute), tokens + (now - last) * self._refill_per_second)
+
+        allowed = tokens >= 1
+        self._buckets[client] = (tokens - 1 if allowed else tokens, now)
+        self._buckets.move_to_end(client)
+        self._prune(now)
+
+        if not allowed:
+            self._rejected += 1
+            return (1 - tokens) / self._refill_per_second
+        return 0.0
+
+    def _prune(self, now: float):
+        """Drop refilled buckets, then the least recently seen clients over the cap."""
+        # Buckets are in least recently seen order, so only the front needs checking
+        while self._buckets:
+            client, (_, last) = next(iter(self._buckets.items()))
+            if now - last < BUCKET_IDLE_SECONDS and len(self._buckets) <= MAX_TRACKED_CLIENTS:
+                break
+            del self._buckets[client]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limit, tracked clients and rejection count."""
+        return {
+            "per_minute": self.per_minute,
+            "tracked_clients": len(self._buckets),
+            "rejected": self._rejected
+        }
+
+# Global client rate limiters
+_limiters: Dict[str, ClientRateLimiter] = {}
+
+def get_client_rate_limiter(name: str, per_minute: int) -> ClientRateLimiter:
+    """Get or create the client rate limiter for name (per_minute only applies on creation)."""
+    if name not in _limiters:
+        _limiters[name] = ClientRateLimiter(name, per_minute)
+    return _limiters[name]
+
+def get_all_client_stats() -> Dict[str, Any]:
+    """Get statistics for all client rate limiters."""
+    return {name: limiter.get_stats() for name, limiter in _limiters.items()}
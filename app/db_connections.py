@@ -7,8 +7,16 @@ from dotenv import load_dotenv
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import asyncpg
+import orjson
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
+from qdrant_client.models import (
+    Distance,
+    VectorParams,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType
+)
 import openai
 from openai import AsyncOpenAI
 import logging
@@ -26,14 +34,99 @@ PG_PARAMS = {
     "host": os.getenv("PG_HOST"),
     "port": os.getenv("PG_PORT"),
 }
+# asyncpg pool shared by every DatabaseConnections instance in the process
+PG_POOL_MIN_SIZE = int(os.getenv("PG_POOL_MIN_SIZE", 1))
+PG_POOL_MAX_SIZE = int(os.getenv("PG_POOL_MAX_SIZE", 25))
 
 # --- QDRANT CONNECTION ---
 QDRANT_URL = os.getenv("QDRANT_URL")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+# Points per upsert request and upsert requests in flight per store_vectors call
+QDRANT_BATCH_SIZE = int(os.getenv("QDRANT_BATCH_SIZE", 128))
+QDRANT_UPSERT_CONCURRENCY = int(os.getenv("QDRANT_UPSERT_CONCURRENCY", 2))
 
 # --- OPENAI CONNECTION ---
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Keep-alive HTTP clients shared by every DatabaseConnections instance, created and
+# tested once so per-request instances don't repeat TLS handshakes or test calls
+_shared_pg_pool_task: Optional[asyncio.Task] = None
+_shared_qdrant_client: Optional[QdrantClient] = None
+_shared_openai_client: Optional[AsyncOpenAI] = None
+_openai_connection_tested = False
+
+def get_shared_openai_client() -> Optional[AsyncOpenAI]:
+    """
+    Get the process-wide AsyncOpenAI client, creating it on first use.
+    
+    Embeddings and AI scene analysis share it so OpenAI calls reuse one
+    keep-alive connection pool.
+    
+    Returns:
+        The shared client, or None if OPENAI_API_KEY is not set
+    """
+    global _shared_openai_client
+    if _shared_openai_client is None and OPENAI_API_KEY:
+        _shared_openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
+    return _shared_openai_client
+
+def _encode_json(value: Any) -> str:
+    """Encode a Python value for a JSON/JSONB column using orjson."""
+    return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+
+async def _init_pg_connection(conn: asyncpg.Connection):
+    """Register orjson as the JSON/JSONB codec on every new pool connection."""
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            type_name,
+            encoder=_encode_json,
+            decoder=orjson.loads,
+            schema='pg_catalog',
+            format='text'
+        )
+
+async def _create_pg_pool(dsn: str) -> asyncpg.Pool:
+    """Open the asyncpg pool with orjson JSON codecs on every connection."""
+    pool = await asyncpg.create_pool(
+        dsn,
+        min_size=PG_POOL_MIN_SIZE,
+        max_size=PG_POOL_MAX_SIZE,
+        command_timeout=60,
+        init=_init_pg_connection
+    )
+    logger.info("✅ PostgreSQL connection established")
+    return pool
+
+async def get_shared_pg_pool(dsn: str) -> asyncpg.Pool:
+    """
+    Get the process-wide asyncpg pool, creating it on first use.
+    
+    Per-request SimpleVideoDatabase instances borrow connections from it instead
+    of each opening (and never closing) a pool of their own. Concurrent first
+    callers share one creation; a failed creation is retried on the next call.
+    
+    Args:
+        dsn: PostgreSQL connection string
+        
+    Returns:
+        The shared pool for the running event loop
+    """
+    global _shared_pg_pool_task
+    loop = asyncio.get_running_loop()
+    task = _shared_pg_pool_task
+    failed = task is not None and task.done() and (task.cancelled() or task.exception() is not None)
+    if task is None or failed or task.get_loop() is not loop:
+        task = _shared_pg_pool_task = loop.create_task(_create_pg_pool(dsn))
+    return await asyncio.shield(task)
+
+async def close_shared_pg_pool():
+    """Close the process-wide asyncpg pool (call once at shutdown)."""
+    global _shared_pg_pool_task
+    task, _shared_pg_pool_task = _shared_pg_pool_task, None
+    if task is not None and task.done() and not task.cancelled() and task.exception() is None:
+        await task.result().close()
+        logger.info("PostgreSQL pool closed")
+
 class DatabaseConnections:
     """Unified database connections manager for PostgreSQL, Qdrant, and OpenAI."""
     
@@ -51,28 +144,26 @@ class DatabaseConnections:
         """Connect to all databases and return status."""
         results = {}
         
-        # Connect to PostgreSQL
+        # Connect to PostgreSQL (pool shared across instances)
         try:
-            self.pg_pool = await asyncpg.create_pool(
-                self._pg_connection_string,
-                min_size=1,
-                max_size=10,
-                command_timeout=60
-            )
+            self.pg_pool = await get_shared_pg_pool(self._pg_connection_string)
             results['postgresql'] = True
-            logger.info("✅ PostgreSQL connection established")
         except Exception as e:
             logger.error(f"❌ PostgreSQL connection failed: {e}")
             results['postgresql'] = False
         
-        # Connect to Qdrant
+        # Connect to Qdrant (HTTP client shared across instances)
+        global _shared_qdrant_client
         try:
             if QDRANT_URL and QDRANT_API_KEY:
-                self.qdrant_client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
-                # Test connection
-                collections = self.qdrant_client.get_collections()
+                if _shared_qdrant_client is None:
+                    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+                    # Test connection
+                    await asyncio.to_thread(client.get_collections)
+                    _shared_qdrant_client = client
+                    logger.info("✅ Qdrant connection established")
+                self.qdrant_client = _shared_qdrant_client
                 results['qdrant'] = True
-                logger.info("✅ Qdrant connection established")
             else:
                 logger.warning("⚠️ Qdrant credentials missing - vectorization disabled")
                 results['qdrant'] = False
@@ -80,17 +171,21 @@ class DatabaseConnections:
             logger.error(f"❌ Qdrant connection failed: {e}")
             results['qdrant'] = False
         
-        # Connect to OpenAI
+        # Connect to OpenAI (HTTP client shared across instances)
+        global _openai_connection_tested
         try:
             if OPENAI_API_KEY:
-                self.openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
-                # Test with a simple embedding
-                response = await self.openai_client.embeddings.create(
-                    input="test",
-                    model="text-embedding-3-small"
-                )
+                client = get_shared_openai_client()
+                if not _openai_connection_tested:
+                    # Test with a simple embedding
+                    response = await client.embeddings.create(
+                        input="test",
+                        model="text-embedding-3-small"
+                    )
+                    _openai_connection_tested = True
+                    logger.info("✅ OpenAI connection established")
+                self.openai_client = client
                 results['openai'] = True
-                logger.info("✅ OpenAI connection established")
             else:
                 logger.warning("⚠️ OpenAI API key missing - embeddings disabled")
                 results['openai'] = False
@@ -101,10 +196,10 @@ class DatabaseConnections:
         return results
     
     async def close_all(self):
-        """Close all database connections."""
+        """Close all database connections (the shared pool too - call at shutdown)."""
         if self.pg_pool:
-            await self.pg_pool.close()
-            logger.info("PostgreSQL pool closed")
+            self.pg_pool = None
+            await close_shared_pg_pool()
         
         if self.qdrant_client:
             # Qdrant client doesn't need explicit closing
@@ -143,15 +238,23 @@ class DatabaseConnections:
             return False
         
         try:
-            collections = self.qdrant_client.get_collections()
+            collections = await asyncio.to_thread(self.qdrant_client.get_collections)
             collection_names = [col.name for col in collections.collections]
             
             if collection_name not in collection_names:
-                self.qdrant_client.create_collection(
+                await asyncio.to_thread(
+                    self.qdrant_client.create_collection,
                     collection_name=collection_name,
                     vectors_config=VectorParams(
                         size=vector_size,  # OpenAI text-embedding-3-small dimensions
                         distance=Distance.COSINE
+                    ),
+                    # int8 copies kept in RAM for search; FP32 originals used for rescoring
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            always_ram=True
+                        )
                     )
                 )
                 logger.info(f"✅ Created Qdrant collection: {collection_name}")
@@ -200,7 +303,8 @@ class DatabaseConnections:
                 payload=metadata
             )
             
-            self.qdrant_client.upsert(
+            await asyncio.to_thread(
+                self.qdrant_client.upsert,
                 collection_name=collection_name,
                 points=[point]
             )
@@ -210,6 +314,51 @@ class DatabaseConnections:
             logger.error(f"❌ Failed to store vector {vector_id}: {e}")
             return False
     
+    async def store_vectors(self, collection_name: str, vectors: List[Dict[str, Any]],
+                            batch_size: int = QDRANT_BATCH_SIZE) -> bool:
+        """
+        Store many vectors in Qdrant with one upsert per batch.
+        
+        Up to QDRANT_UPSERT_CONCURRENCY batches are sent at once so Qdrant
+        stays busy while the next request is serialized.
+        
+        Args:
+            collection_name: Target collection
+            vectors: Dicts with "id", "embedding" and "metadata" keys
+            batch_size: Maximum points sent per upsert request
+            
+        Returns:
+            True if every batch was stored, False otherwise
+        """
+        if not self.qdrant_client:
+            logger.warning("Qdrant client not available")
+            return False
+        
+        try:
+            points = [
+                PointStruct(id=v["id"], vector=v["embedding"], payload=v["metadata"])
+                for v in vectors
+            ]
+            upsert_slots = asyncio.Semaphore(QDRANT_UPSERT_CONCURRENCY)
+            
+            async def upsert_batch(batch: List[PointStruct]):
+                async with upsert_slots:
+                    await asyncio.to_thread(
+                        self.qdrant_client.upsert,
+                        collection_name=collection_name,
+                        points=batch
+                    )
+            
+            await asyncio.gather(*(
+                upsert_batch(points[start:start + batch_size])
+                for start in range(0, len(points), batch_size)
+            ))
+            logger.debug(f"✅ Stored {len(points)} vectors in {collection_name}")
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to store {len(vectors)} vectors in {collection_name}: {e}")
+            return False
+    
     # --- TEST METHODS ---
     
     async def test_all_connections(self) -> Dict[str, bool]:
@@ -228,7 +377,7 @@ class DatabaseConnections:
         # Test Qdrant
         try:
             if self.qdrant_client:
-                collections = self.qdrant_client.get_collections()
+                await asyncio.to_thread(self.qdrant_client.get_collections)
                 results['qdrant'] = True
             else:
                 results['qdrant'] = False
@@ -5,6 +5,8 @@ import instaloader
 import yt_dlp
 from typing import Dict, List, Optional
 
+from app.utils import run_blocking
+
 async def ensure_temp_dir() -> str:
     """Ensure temp directory exists and return its path."""
     temp_dir = os.path.join(os.path.dirname(__file__), 'temp')
@@ -29,7 +31,7 @@ async def download_youtube(url: str, temp_dir: str) -> Dict:
             return info.get('tags', []) or [], info.get('description', '')
 
     # Run yt-dlp in a thread since it's blocking
-    tags, description = await asyncio.to_thread(_download)
+    tags, description = await run_blocking(_download)
 
     # List files in temp directory
     files = await asyncio.to_thread(
@@ -68,7 +70,7 @@ async def download_instagram(url: str, temp_dir: str) -> Dict:
 
     try:
         # Run instaloader in a thread since it's blocking
-        tags, description = await asyncio.to_thread(_download)
+        tags, description = await run_blocking(_download)
 
         # List files in temp directory
         def _list_files():
@@ -83,7 +85,7 @@ async def download_instagram(url: str, temp_dir: str) -> Dict:
 
         if not files:
             # Fallback to command line instaloader
-            await asyncio.to_thread(
+            await run_blocking(
                 lambda: os.system(f"instaloader --dirname-pattern={temp_dir} --no-metadata-json {clean_url}")
             )
             files = await asyncio.to_thread(
@@ -93,7 +95,7 @@ async def download_instagram(url: str, temp_dir: str) -> Dict:
 
     except Exception as e:
         # Fallback to command line instaloader
-        await asyncio.to_thread(
+        await run_blocking(
             lambda: os.system(f"instaloader --dirname-pattern={temp_dir} --no-metadata-json {clean_url}")
         )
         files = await asyncio.to_thread(
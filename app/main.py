@@ -1,37 +1,204 @@
 # main.py
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, HttpUrl
-from typing import Optional, Dict
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Dict
 import uvicorn
 import os
 import asyncio
+import hashlib
+import logging
+import math
+import secrets
+import time
+import uuid
+import orjson
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 # Import your actual functions
-from app.simple_unified_processor import process_video_unified_simple, get_carousel_videos
+from app.simple_unified_processor import (
+    process_video_unified_simple,
+    get_carousel_videos,
+    get_processed_result_simple,
+    get_video_simple,
+    open_video_stream_simple,
+    search_videos_simple,
+    search_videos_simple_stream,
+    list_videos_simple,
+    normalize_url
+)
+from app.vectorization import VectorizeExistingVideos
+from app.db_connections import DatabaseConnections
+from qdrant_client.models import OptimizersConfigDiff
+from app.response_cache import get_response_cache
+from app.admission import AdmissionController, get_admission_controller
+from app.ai_rate_limiter import get_all_usage_stats
+from app.client_rate_limiter import get_all_client_stats, get_client_rate_limiter
 from app.utils import is_valid_url
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Gilgamesh Media Processing Service",
     description="Process Instagram posts, reels, and YouTube videos with AI scene analysis and transcript integration. Supports Instagram carousels with multiple videos.",
-    version="2.2.12"
+    version="2.2.12",
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allows all origins
-    allow_credentials=True,
-    allow_methods=["*"],  # Allows all methods
-    allow_headers=["*"],  # Allows all headers
-)
+# CORS is only needed for browser clients; set ENABLE_CORS=0 when an ingress handles it
+ENABLE_CORS = os.getenv("ENABLE_CORS", "1") == "1"
+CORS_ALLOW_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",") if origin.strip()]
+
+if ENABLE_CORS:
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ALLOW_ORIGINS,
+        # Browsers reject credentials with a wildcard origin
+        allow_credentials="*" not in CORS_ALLOW_ORIGINS,
+        allow_methods=["GET", "POST"],  # The only methods this API serves
+        allow_headers=["*"],  # Allows all headers
+    )
+
+# Compress JSON responses; video streams opt out via Content-Encoding: identity
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # Concurrency control
+# Heavy /process jobs and admin endpoints get separate slots so one can't starve the other;
+# read endpoints are not gated
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 10))
+MAX_PROCESS_REQUESTS = int(os.getenv("MAX_PROCESS_REQUESTS", 4))
+MAX_ADMIN_REQUESTS = int(os.getenv("MAX_ADMIN_REQUESTS", 8))
+# Highest limit POST /admin/concurrency accepts
+MAX_ADMISSION_LIMIT = int(os.getenv("MAX_ADMISSION_LIMIT", 64))
+# Token required by POST /admin/concurrency (X-Admin-Token header); unset disables the endpoint
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
 REQUEST_TIMEOUT_SECONDS = int(os.getenv("REQUEST_TIMEOUT_SECONDS", 30))
-semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+PROCESS_TIMEOUT_SECONDS = int(os.getenv("PROCESS_TIMEOUT_SECONDS", 900))
+VECTORIZE_TIMEOUT_SECONDS = int(os.getenv("VECTORIZE_TIMEOUT_SECONDS", 3600))
+# Threads behind asyncio.to_thread; the asyncio default (cpu_count + 4, max 32) is easily
+# exhausted by concurrent downloads, transcriptions and Qdrant calls
+THREAD_POOL_WORKERS = int(os.getenv("THREAD_POOL_WORKERS", max(40, MAX_CONCURRENT_REQUESTS * 4)))
+# How long a request may wait for an admission slot before getting 503
+ADMISSION_WAIT_SECONDS = float(os.getenv("ADMISSION_WAIT_SECONDS", 0.05))
+# Per-client request budgets (0 disables, the default)
+PROCESS_RATE_LIMIT_PER_MINUTE = int(os.getenv("PROCESS_RATE_LIMIT_PER_MINUTE", 0))
+SEARCH_RATE_LIMIT_PER_MINUTE = int(os.getenv("SEARCH_RATE_LIMIT_PER_MINUTE", 0))
+CAROUSEL_RATE_LIMIT_PER_MINUTE = int(os.getenv("CAROUSEL_RATE_LIMIT_PER_MINUTE", 0))
+# Header set by a trusted reverse proxy with the real client address (e.g. X-Forwarded-For);
+# unset keys clients on the socket peer address
+CLIENT_IP_HEADER = os.getenv("CLIENT_IP_HEADER", "").strip()
+# Trusted proxies in front of the app; each appends the address it saw to CLIENT_IP_HEADER
+TRUSTED_PROXY_HOPS = max(1, int(os.getenv("TRUSTED_PROXY_HOPS", 1)))
+
+# /qdrant/force-index polls collection status until indexing moves, backing off
+# from the initial interval up to the max interval
+INDEX_POLL_INITIAL_INTERVAL_SECONDS = 0.05
+INDEX_POLL_MAX_INTERVAL_SECONDS = 0.5
+INDEX_POLL_MAX_SECONDS = 10
+
+# Optimizer settings applied by /qdrant/force-index: threshold 1 forces immediate
+# indexing, 20000 is Qdrant's default
+FORCE_INDEX_OPTIMIZER_CONFIG = OptimizersConfigDiff(indexing_threshold=1)
+DEFAULT_INDEX_OPTIMIZER_CONFIG = OptimizersConfigDiff(indexing_threshold=20000)
+
+def process_admission() -> AdmissionController:
+    """Admission slots for /process pipeline runs."""
+    return get_admission_controller("process", MAX_PROCESS_REQUESTS)
+
+def admin_admission() -> AdmissionController:
+    """Admission slots for admin endpoints (Qdrant indexing)."""
+    return get_admission_controller("admin", MAX_ADMIN_REQUESTS)
+
+@asynccontextmanager
+async def admitted(controller: AdmissionController, timeout: Optional[float] = ADMISSION_WAIT_SECONDS):
+    """Hold an admission slot, failing fast with 503 instead of queuing when all are busy."""
+    try:
+        await controller.acquire(timeout=timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Server busy, retry", headers={"Retry-After": "5"})
+    try:
+        yield
+    finally:
+        await controller.release()
+
+def client_address(request: Request) -> str:
+    """Client key for rate limiting: the trusted proxy header if configured, else the peer address."""
+    if CLIENT_IP_HEADER:
+        forwarded = request.headers.get(CLIENT_IP_HEADER)
+        if forwarded:
+            # Proxies append to X-Forwarded-For, so entries left of the ones our trusted
+            # proxies added are whatever the client sent and can't be used as a key
+            hops = [hop.strip() for hop in forwarded.split(",")]
+            return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
+    return request.client.host if request.client else "unknown"
+
+def rate_limited(name: str, per_minute: int) -> Callable[[Request], Awaitable[None]]:
+    """
+    Build a route dependency that rejects clients over their request budget with 429.
+    
+    Args:
+        name: Limiter name (one budget per name and client address)
+        per_minute: Requests allowed per client per minute (0 disables the limit)
+    """
+    async def check_rate_limit(request: Request):
+        if per_minute <= 0:
+            return
+        client = client_address(request)
+        retry_after = get_client_rate_limiter(name, per_minute).check(client)
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, retry later",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+    return check_rate_limit
+
+process_rate_limit = Depends(rate_limited("process", PROCESS_RATE_LIMIT_PER_MINUTE))
+search_rate_limit = Depends(rate_limited("search", SEARCH_RATE_LIMIT_PER_MINUTE))
+carousel_rate_limit = Depends(rate_limited("carousel", CAROUSEL_RATE_LIMIT_PER_MINUTE))
+
+# /process results with at least this many videos are serialized one video at a time
+STREAM_RESULT_MIN_VIDEOS = int(os.getenv("STREAM_RESULT_MIN_VIDEOS", 10))
+
+# Largest limit accepted by /search and /videos
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 100))
+
+# In-flight /process runs keyed by normalized URL and processing options
+inflight_process_jobs: Dict[tuple, asyncio.Task] = {}
+# In-flight read lookups keyed like the response cache
+inflight_reads: Dict[tuple, asyncio.Task] = {}
+# Connected /process callers per in-flight run
+process_job_waiters: Dict[asyncio.Task, int] = {}
+
+# Cancel runs whose callers have all disconnected instead of finishing them unseen
+CANCEL_ON_DISCONNECT = os.getenv("CANCEL_ON_DISCONNECT", "1") == "1"
+
+# Vectorization runs are serialized over one app-scoped vectorizer
+vectorizer_lock = asyncio.Lock()
+
+# Background vectorization jobs: queue consumed by vectorize_worker, recent job states by ID
+MAX_VECTORIZE_JOBS = 100
+vectorize_queue: asyncio.Queue = asyncio.Queue()
+vectorize_jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Background /process jobs: queue drained by one worker per process slot, recent job states by ID.
+# The queue is bounded so background=true can't bypass /process backpressure
+MAX_PROCESS_JOBS = 100
+MAX_QUEUED_PROCESS_JOBS = int(os.getenv("MAX_QUEUED_PROCESS_JOBS", 20))
+process_queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUED_PROCESS_JOBS)
+process_jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+# Request payloads are read-only; unknown fields (e.g. misspelled flags) are rejected
+REQUEST_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True)
 
 class ProcessRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     url: HttpUrl
     save_video: bool = True
     transcribe: bool = True
@@ -40,162 +207,660 @@ class ProcessRequest(BaseModel):
     save_to_qdrant: bool = True
     include_base64: bool = False
     raw_transcript: bool = False  # Return raw text without timestamps
+    background: bool = False  # Queue the run and return 202 with a job_id
 
 class CarouselRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     url: HttpUrl
     include_base64: bool = False
 
 class VectorizeExistingRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
     limit: Optional[int] = None
     dry_run: bool = False
     verbose: bool = False
+    batch_size: int = Field(default=64, ge=1, le=1000)
+    background: bool = False  # Queue the job and return a job_id instead of waiting
 
 class QdrantIndexRequest(BaseModel):
-    collections: Optional[list] = None  # Specific collections to index, or None for default
+    model_config = REQUEST_MODEL_CONFIG
+    
+    collections: Optional[List[str]] = None  # Specific collections to index, or None for default
     force_rebuild: bool = False  # Whether to force full index rebuild
 
-@app.get("/")
-async def root():
-    return {
-        "message": "Gilgamesh Media Processing Service",
-        "version": "2.2.12",
-        "features": [
-            "Instagram carousel support",
-            "Smart AI credit management",
-            "Enhanced video context analysis",
-            "Graceful audio handling",
-            "Multi-video processing"
-        ],
-        "endpoints": {
-            "process": {
-                "/process": "Main processing endpoint with all options - checks if URL already processed"
-            },
-            "vectorization": {
-                "/vectorize/existing": "Vectorize unvectorized videos in database",
-                "/qdrant/force-index": "Force indexing of Qdrant collections for AI video compilation"
-            },
-            "retrieval": {
-                "/video/{video_id}": "Get specific video by ID",
-                "/carousel": "Get all videos from carousel URL",
-                "/search": "Search videos by content",
-                "/videos": "List recent videos"
-            }
+class ConcurrencyRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+    
+    process: Optional[int] = Field(default=None, ge=1, le=MAX_ADMISSION_LIMIT)  # New /process slot limit
+    admin: Optional[int] = Field(default=None, ge=1, le=MAX_ADMISSION_LIMIT)  # New admin endpoint slot limit
+
+# Static service description, serialized once at import
+ROOT_RESPONSE_BODY = orjson.dumps({
+    "message": "Gilgamesh Media Processing Service",
+    "version": "2.2.12",
+    "features": [
+        "Instagram carousel support",
+        "Smart AI credit management",
+        "Enhanced video context analysis",
+        "Graceful audio handling",
+        "Multi-video processing"
+    ],
+    "endpoints": {
+        "process": {
+            "/process": "Main processing endpoint with all options - checks if URL already processed",
+            "/process/stream": "Same as /process, streaming each video as a Server-Sent Event",
+            "/process/status/{job_id}": "Status and result of a background (background=true) /process job"
+        },
+        "vectorization": {
+            "/vectorize/existing": "Vectorize unvectorized videos in database",
+            "/vectorize/status/{job_id}": "Status and result of a background vectorization job",
+            "/qdrant/force-index": "Force indexing of Qdrant collections for AI video compilation"
+        },
+        "retrieval": {
+            "/video/{video_id}": "Get specific video by ID",
+            "/video/{video_id}/raw": "Stream the stored video as MP4 bytes",
+            "/carousel": "Get all videos from carousel URL",
+            "/search": "Search videos by content",
+            "/videos": "List recent videos"
+        },
+        "admin": {
+            "/admin/concurrency": "Get (GET) or change (POST) admission limits at runtime"
         }
     }
+})
+
+@app.get("/")
+async def root():
+    return Response(content=ROOT_RESPONSE_BODY, media_type="application/json")
+
+def add_raw_transcript(video: Dict) -> Dict:
+    """Return a copy of a processed video with a plain-text transcript (no timestamps) added."""
+    transcript_data = video.get("results", {}).get("transcript_data")
+    if transcript_data:
+        # Convert timestamped segments to raw text
+        raw_text = ' '.join(segment['text'].strip() for segment in transcript_data)
+        video = {**video, "results": {**video["results"], "raw_transcript": raw_text}}
+    return video
+
+def add_raw_transcripts(result: Dict) -> Dict:
+    """
+    Add a plain-text transcript (no timestamps) to each processed video.
+    
+    Returns a copy so results shared between coalesced requests are not mutated.
+    """
+    return {**result, "videos": [add_raw_transcript(video) for video in result.get("videos", [])]}
+
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialize a response body with orjson.
+    
+    jsonable_encoder only runs for values orjson can't encode natively (sets,
+    Decimals, models) instead of walking the whole structure first.
+    """
+    return orjson.dumps(content, default=jsonable_encoder, option=JSON_OPTIONS)
+
+# Base64 video is high-entropy: gzip spends CPU on it for little size gain
+UNCOMPRESSED_HEADERS = {"Content-Encoding": "identity"}
+
+def json_response(content: Any, compress: bool = True) -> Response:
+    """Return content as a JSON response, bypassing FastAPI's jsonable_encoder pass."""
+    return Response(
+        content=dump_json(content),
+        media_type="application/json",
+        headers=None if compress else UNCOMPRESSED_HEADERS
+    )
+
+def iter_json_result(result: Dict) -> Iterator[bytes]:
+    """
+    Serialize a processing result as JSON one video at a time.
+    
+    Yields the top-level fields first, then each entry of "videos", so only one
+    video's JSON is held in memory at once.
+    """
+    head = dump_json({k: v for k, v in result.items() if k != "videos"})
+    yield head[:-1] + (b',' if len(head) > 2 else b'') + b'"videos":['
+    
+    for index, video in enumerate(result.get("videos", [])):
+        prefix = b',' if index else b''
+        yield prefix + dump_json(video)
+    
+    yield b']}'
+
+def sse_event(event: str, data: Dict) -> bytes:
+    """Encode one Server-Sent Event with a JSON payload."""
+    return b"event: " + event.encode() + b"\ndata: " + dump_json(data) + b"\n\n"
+
+async def run_process_job(request: ProcessRequest, url: str,
+                          on_video: Optional[Callable[[Dict], Awaitable[None]]] = None,
+                          admission_timeout: Optional[float] = ADMISSION_WAIT_SECONDS) -> Dict:
+    """Run the processing pipeline in a process slot; raises HTTPException on failure."""
+    async with admitted(process_admission(), timeout=admission_timeout):
+        try:
+            # A hung download must not hold a processing slot forever
+            result = await asyncio.wait_for(
+                process_video_unified_simple(
+                    url=url,
+                    save_video=request.save_video,
+                    transcribe=request.transcribe,
+                    describe=request.describe,
+                    save_to_postgres=request.save_to_postgres,
+                    save_to_qdrant=request.save_to_qdrant,
+                    include_base64=request.include_base64,
+                    on_video=on_video
+                ),
+                timeout=PROCESS_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"Processing timed out after {PROCESS_TIMEOUT_SECONDS}s")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+    
+    if not result["success"]:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result.get("error", "Processing failed"))
+    
+    # Stored videos may have changed - drop cached reads
+    get_response_cache().clear()
+    return result
+
+def start_process_job(request: ProcessRequest, url: str) -> asyncio.Task:
+    """Start a processing job, or join the one already running for the same URL and options."""
+    key = (
+        normalize_url(url),
+        request.save_video,
+        request.transcribe,
+        request.describe,
+        request.save_to_postgres,
+        request.save_to_qdrant,
+        request.include_base64
+    )
+    job = inflight_process_jobs.get(key)
+    if job is None:
+        job = asyncio.ensure_future(run_process_job(request, url))
+        inflight_process_jobs[key] = job
+        
+        def finish(task: asyncio.Task):
+            # A cancelled run may already have been replaced by a newer one
+            if inflight_process_jobs.get(key) is task:
+                del inflight_process_jobs[key]
+            process_job_waiters.pop(task, None)
+            # Mark the outcome as retrieved even if every caller went away
+            if not task.cancelled():
+                task.exception()
+        
+        job.add_done_callback(finish)
+    return job
+
+async def wait_for_disconnect(http_request: Request):
+    """Return once the client has closed the connection (the request body is already read)."""
+    while (await http_request.receive())["type"] != "http.disconnect":
+        pass
+
+async def await_process_job(job: asyncio.Task, http_request: Request) -> Dict:
+    """
+    Wait for a shared processing run on behalf of one caller.
+    
+    When the caller disconnects and no other caller is still waiting, the run is
+    cancelled. It stops once its current download, transcription or scene step
+    finishes, then releases its processing slot and temp files. Videos it already
+    stored are kept and skipped when the URL is processed again.
+    """
+    if not CANCEL_ON_DISCONNECT:
+        # Shield so one caller disconnecting doesn't cancel the run for the others
+        return await asyncio.shield(job)
+    
+    process_job_waiters[job] = process_job_waiters.get(job, 0) + 1
+    disconnected = asyncio.ensure_future(wait_for_disconnect(http_request))
+    try:
+        await asyncio.wait({job, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnected.cancel()
+        if job in process_job_waiters:
+            process_job_waiters[job] -= 1
+    
+    if job.cancelled():
+        raise HTTPException(status_code=503, detail="Processing run was cancelled, retry", headers={"Retry-After": "1"})
+    if job.done():
+        return job.result()
+    
+    if not process_job_waiters.get(job):
+        logger.info("🛑 All callers disconnected, cancelling processing run")
+        # Unlist it first so later identical requests start a fresh run instead of joining this one
+        for key, task in list(inflight_process_jobs.items()):
+            if task is job:
+                del inflight_process_jobs[key]
+        job.cancel()
+    raise HTTPException(status_code=499, detail="Client closed request")
 
-@app.post("/process")
-async def process_video(request: ProcessRequest):
+@app.post("/process", dependencies=[process_rate_limit])
+async def process_video(request: ProcessRequest, http_request: Request):
     """
     Main video processing endpoint with all options.
     Automatically checks if URL has already been processed to save AI credits.
     Supports Instagram carousels - processes all videos in carousel.
+    Concurrent identical requests share one processing run, which is cancelled
+    once every caller waiting on it has disconnected.
     """
-    async with semaphore:
+    url = str(request.url)
+    if not is_valid_url(url):
+        raise HTTPException(status_code=400, detail="Unsupported URL - only Instagram, YouTube and TikTok links are accepted")
+    
+    # Fully processed posts are answered without taking a processing slot
+    if not request.include_base64:
+        result = await get_processed_result_simple(
+            url,
+            save_video=request.save_video,
+            transcribe=request.transcribe,
+            describe=request.describe
+        )
+        if result:
+            return json_response(add_raw_transcripts(result) if request.raw_transcript else result)
+    
+    if request.background:
+        job_id = str(uuid.uuid4())
         try:
-            url = str(request.url)
-            if not is_valid_url(url):
-                raise HTTPException(status_code=400, detail="Invalid URL format")
-            
-            result = await process_video_unified_simple(
-                url=url,
-                save_video=request.save_video,
-                transcribe=request.transcribe,
-                describe=request.describe,
-                save_to_postgres=request.save_to_postgres,
-                save_to_qdrant=request.save_to_qdrant,
-                include_base64=request.include_base64
-            )
-            
-            # Post-process for raw transcript if requested
-            if request.raw_transcript and result["success"]:
-                for video in result.get("videos", []):
-                    transcript_data = video.get("results", {}).get("transcript_data")
-                    if transcript_data:
-                        # Convert timestamped segments to raw text
-                        raw_text = ' '.join([segment['text'].strip() for segment in transcript_data])
-                        video["results"]["raw_transcript"] = raw_text
+            process_queue.put_nowait((job_id, request))
+        except asyncio.QueueFull:
+            raise HTTPException(status_code=503, detail="Processing queue full, retry", headers={"Retry-After": "30"})
+        record_process_job(job_id, {"job_id": job_id, "status": "queued", "url": url})
+        return ORJSONResponse(status_code=202, content={
+            "success": True,
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/process/status/{job_id}"
+        })
+    
+    result = await await_process_job(start_process_job(request, url), http_request)
+    
+    # Post-process for raw transcript if requested
+    if request.raw_transcript:
+        result = add_raw_transcripts(result)
+    
+    # Large carousels are serialized one video at a time to cap peak serialization memory;
+    # the result is already complete, so this doesn't send the first byte any sooner
+    if len(result.get("videos", [])) >= STREAM_RESULT_MIN_VIDEOS:
+        return StreamingResponse(
+            iter_json_result(result),
+            media_type="application/json",
+            headers=UNCOMPRESSED_HEADERS if request.include_base64 else None
+        )
+    
+    return json_response(result, compress=not request.include_base64)
+
+def record_process_job(job_id: str, job: Dict):
+    """Store a background /process job's state, keeping only the most recent finished jobs."""
+    process_jobs[job_id] = job
+    process_jobs.move_to_end(job_id)
+    # Queued and running jobs are never evicted, so their status stays visible
+    finished = [key for key, state in process_jobs.items() if state["status"] not in ("queued", "running")]
+    for key in finished[:max(0, len(process_jobs) - MAX_PROCESS_JOBS)]:
+        del process_jobs[key]
+
+async def process_worker():
+    """Run queued background /process jobs, waiting for a process slot instead of failing with 503."""
+    while True:
+        job_id, request = await process_queue.get()
+        try:
+            if job_id in process_jobs:
+                process_jobs[job_id]["status"] = "running"
+            try:
+                result = await run_process_job(request, str(request.url), admission_timeout=None)
+                if request.raw_transcript:
+                    result = add_raw_transcripts(result)
+                outcome = {"status": "completed", "result": result}
+            except HTTPException as e:
+                outcome = {"status": "failed", "status_code": e.status_code, "error": e.detail}
+            except Exception as e:
+                logger.error(f"❌ Background processing job {job_id} failed: {e}")
+                outcome = {"status": "failed", "status_code": 500, "error": f"Processing failed: {str(e)}"}
             
-            if result["success"]:
-                return result
-            else:
-                raise HTTPException(status_code=500, detail=result.get("error", "Processing failed"))
+            if job_id in process_jobs:
+                process_jobs[job_id].update(outcome)
+        finally:
+            process_queue.task_done()
+
+@app.get("/process/status/{job_id}")
+async def get_process_status(job_id: str):
+    """Get the status (and result, once finished) of a background /process job."""
+    job = process_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Processing job not found")
+    return job
+
+async def iter_process_events(request: ProcessRequest, url: str, result: Optional[Dict] = None) -> AsyncIterator[bytes]:
+    """
+    Run the pipeline and stream each video as a "video" event as soon as it is processed.
+    
+    A stored result passed in is replayed instead of running the pipeline. Ends with
+    a "done" event carrying the summary fields (everything but "videos"), or an
+    "error" event with the status code the JSON endpoint would have returned.
+    """
+    if result is None:
+        videos: asyncio.Queue = asyncio.Queue()
+        job = asyncio.ensure_future(run_process_job(request, url, on_video=videos.put))
+        # The sentinel ends the stream once the run finishes
+        job.add_done_callback(lambda task: videos.put_nowait(None))
+        
+        try:
+            while (video := await videos.get()) is not None:
+                yield sse_event("video", add_raw_transcript(video) if request.raw_transcript else video)
+        finally:
+            # The stream is closed early when the client disconnects
+            if CANCEL_ON_DISCONNECT and not job.done():
+                logger.info("🛑 Stream client disconnected, cancelling processing run")
+                job.cancel()
+        
+        try:
+            result = job.result()
+        except HTTPException as e:
+            yield sse_event("error", {"status_code": e.status_code, "error": e.detail})
+            return
+    else:
+        for video in result["videos"]:
+            yield sse_event("video", add_raw_transcript(video) if request.raw_transcript else video)
+    
+    yield sse_event("done", {k: v for k, v in result.items() if k != "videos"})
+
+@app.post("/process/stream", dependencies=[process_rate_limit])
+async def process_video_stream(request: ProcessRequest):
+    """
+    Same processing as /process, streamed as Server-Sent Events.
+    
+    Each carousel video is sent as a "video" event when it finishes, so clients
+    see the first result without waiting for the whole carousel.
+    """
+    url = str(request.url)
+    if not is_valid_url(url):
+        raise HTTPException(status_code=400, detail="Unsupported URL - only Instagram, YouTube and TikTok links are accepted")
+    
+    # Fully processed posts are answered without taking a processing slot
+    result = None
+    if not request.include_base64:
+        result = await get_processed_result_simple(
+            url,
+            save_video=request.save_video,
+            transcribe=request.transcribe,
+            describe=request.describe
+        )
+    
+    # Fail fast with a real status code while one can still be sent
+    if result is None and process_admission().locked():
+        raise HTTPException(status_code=503, detail="Server busy, retry", headers={"Retry-After": "5"})
+    
+    return StreamingResponse(
+        iter_process_events(request, url, result),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"}
+    )
+
+@app.on_event("startup")
+async def startup_thread_pool():
+    """Size the default executor used by asyncio.to_thread (downloads, Whisper, Qdrant calls)."""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=THREAD_POOL_WORKERS, thread_name_prefix="gilgamesh")
+    )
+
+@app.on_event("startup")
+async def startup_connections():
+    """Open shared PostgreSQL/Qdrant/OpenAI connections once for the lifetime of the app."""
+    app.state.connections = DatabaseConnections()
+    await app.state.connections.connect_all()
+
+@app.on_event("shutdown")
+async def shutdown_connections():
+    """Close the shared connections."""
+    await app.state.connections.close_all()
+
+@app.on_event("startup")
+async def startup_process_workers():
+    """Start one background /process worker per process slot."""
+    app.state.process_workers = [asyncio.create_task(process_worker()) for _ in range(MAX_PROCESS_REQUESTS)]
+
+@app.on_event("shutdown")
+async def shutdown_process_workers():
+    """Stop the background /process workers."""
+    for worker in app.state.process_workers:
+        worker.cancel()
+
+async def get_vectorizer() -> VectorizeExistingVideos:
+    """Return the shared vectorizer, connecting it on first use."""
+    if app.state.vectorizer is None:
+        vectorizer = VectorizeExistingVideos()
+        await vectorizer.initialize()
+        app.state.vectorizer = vectorizer
+    return app.state.vectorizer
+
+@app.on_event("startup")
+async def startup_vectorizer():
+    """Open vectorizer connections once and start the background vectorization worker."""
+    app.state.vectorizer = None
+    try:
+        await get_vectorizer()
+    except Exception as e:
+        # Keep serving other endpoints; /vectorize/existing retries on demand
+        logger.warning(f"⚠️ Vectorizer not available at startup: {e}")
+    
+    app.state.vectorize_worker = asyncio.create_task(vectorize_worker())
+
+@app.on_event("shutdown")
+async def shutdown_vectorizer():
+    """Stop the background worker and close the shared vectorizer connections."""
+    app.state.vectorize_worker.cancel()
+    if app.state.vectorizer is not None:
+        await app.state.vectorizer.cleanup()
+        app.state.vectorizer = None
+
+async def run_vectorization(request: VectorizeExistingRequest) -> Dict:
+    """
+    Run one vectorization pass on the shared vectorizer and build the endpoint response.
+    
+    Raises asyncio.TimeoutError if the pass exceeds VECTORIZE_TIMEOUT_SECONDS.
+    """
+    async with vectorizer_lock:
+        vectorizer = await get_vectorizer()
+        
+        # Run vectorization with provided parameters
+        result = await asyncio.wait_for(
+            vectorizer.vectorize_all_unvectorized(
+                limit=request.limit,
+                dry_run=request.dry_run,
+                batch_size=request.batch_size
+            ),
+            timeout=VECTORIZE_TIMEOUT_SECONDS
+        )
+    
+    # New vectors change search results
+    if not request.dry_run and result.get("successful"):
+        get_response_cache().clear()
+    
+    # Enhanced response with detailed information
+    response = {
+        "success": result["success"],
+        "message": result["message"],
+        "parameters": {
+            "limit": request.limit,
+            "dry_run": request.dry_run,
+            "verbose": request.verbose,
+            "batch_size": request.batch_size
+        },
+        "results": {
+            "total_videos": result.get("total_videos", 0),
+            "processed": result.get("processed", 0),
+            "successful": result.get("successful", 0),
+            "failed": result.get("failed", 0)
+        }
+    }
+    
+    # Add error details if present
+    if "error" in result:
+        response["error"] = result["error"]
+    
+    # Add video details for dry run
+    if request.dry_run and "videos" in result:
+        response["videos_to_process"] = [
+            {
+                "video_id": video["id"],
+                "url": video["url"],
+                "carousel_index": video.get("carousel_index", 0),
+                "has_transcript": bool(video.get("transcript")),
+                "has_descriptions": bool(video.get("descriptions")),
+                "created_at": video["created_at"]
+            }
+            for video in result["videos"]
+        ]
+    
+    return response
+
+def record_vectorize_job(job_id: str, job: Dict):
+    """Store a background job's state, keeping only the most recent jobs."""
+    vectorize_jobs[job_id] = job
+    vectorize_jobs.move_to_end(job_id)
+    while len(vectorize_jobs) > MAX_VECTORIZE_JOBS:
+        vectorize_jobs.popitem(last=False)
+
+async def vectorize_worker():
+    """
+    Process queued background vectorization jobs one pass at a time.
+    
+    Jobs that are already waiting with identical parameters share a single pass.
+    """
+    while True:
+        pending = [await vectorize_queue.get()]
+        while not vectorize_queue.empty():
+            pending.append(vectorize_queue.get_nowait())
+        
+        groups: Dict[tuple, list] = {}
+        for job_id, request in pending:
+            key = (request.limit, request.dry_run, request.batch_size)
+            groups.setdefault(key, []).append((job_id, request))
+        
+        try:
+            for jobs in groups.values():
+                try:
+                    # Old jobs may have been evicted from the status table while queued
+                    for job_id, _ in jobs:
+                        if job_id in vectorize_jobs:
+                            vectorize_jobs[job_id]["status"] = "running"
+                    
+                    response = await run_vectorization(jobs[0][1])
+                    outcome = {"status": "completed", "result": response}
+                except asyncio.TimeoutError:
+                    outcome = {"status": "failed", "error": f"Vectorization timed out after {VECTORIZE_TIMEOUT_SECONDS}s"}
+                except Exception as e:
+                    logger.error(f"❌ Background vectorization failed: {e}")
+                    outcome = {"status": "failed", "error": f"Vectorization failed: {str(e)}"}
                 
-        except HTTPException:
-            raise
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Processing failed: {str(e)}")
+                for job_id, _ in jobs:
+                    if job_id in vectorize_jobs:
+                        vectorize_jobs[job_id].update(outcome)
+        finally:
+            for _ in pending:
+                vectorize_queue.task_done()
 
 @app.post("/vectorize/existing")
 async def vectorize_existing_videos(request: VectorizeExistingRequest):
     """
     Vectorize existing videos in the database that haven't been vectorized yet.
     Creates individual vector points for each transcript segment and scene description.
+    With background=true the job is queued and a job_id is returned for /vectorize/status/{job_id}.
     """
-    async with semaphore:
-        try:
-            # Import the vectorization class
-            import sys
-            import os
-            
-            # Import the vectorization class from the app module
-            from app.vectorization import VectorizeExistingVideos
-            
-            # Create vectorizer instance
-            vectorizer = VectorizeExistingVideos()
-            
-            try:
-                # Initialize database connections
-                await vectorizer.initialize()
-                
-                # Run vectorization with provided parameters
-                result = await vectorizer.vectorize_all_unvectorized(
-                    limit=request.limit,
-                    dry_run=request.dry_run
-                )
-                
-                # Enhanced response with detailed information
-                response = {
-                    "success": result["success"],
-                    "message": result["message"],
-                    "parameters": {
-                        "limit": request.limit,
-                        "dry_run": request.dry_run,
-                        "verbose": request.verbose
-                    },
-                    "results": {
-                        "total_videos": result.get("total_videos", 0),
-                        "processed": result.get("processed", 0),
-                        "successful": result.get("successful", 0),
-                        "failed": result.get("failed", 0)
-                    }
-                }
-                
-                # Add error details if present
-                if "error" in result:
-                    response["error"] = result["error"]
-                
-                # Add video details for dry run
-                if request.dry_run and "videos" in result:
-                    response["videos_to_process"] = [
-                        {
-                            "video_id": video["id"],
-                            "url": video["url"],
-                            "carousel_index": video.get("carousel_index", 0),
-                            "has_transcript": bool(video.get("transcript")),
-                            "has_descriptions": bool(video.get("descriptions")),
-                            "created_at": str(video["created_at"])
-                        }
-                        for video in result["videos"]
-                    ]
-                
-                return response
-                
-            finally:
-                # Always cleanup connections
-                await vectorizer.cleanup()
-                
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Vectorization failed: {str(e)}")
+    if request.background:
+        job_id = str(uuid.uuid4())
+        record_vectorize_job(job_id, {"job_id": job_id, "status": "queued"})
+        await vectorize_queue.put((job_id, request))
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/vectorize/status/{job_id}"
+        }
+    
+    try:
+        return await run_vectorization(request)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Vectorization timed out after {VECTORIZE_TIMEOUT_SECONDS}s")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Vectorization failed: {str(e)}")
+
+@app.get("/vectorize/status/{job_id}")
+async def get_vectorize_status(job_id: str):
+    """Get the status (and result, once finished) of a background vectorization job."""
+    job = vectorize_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Vectorization job not found")
+    return job
+
+async def reindex_collection(connections: DatabaseConnections, collection_name: str, force_rebuild: bool) -> Dict:
+    """
+    Trigger indexing for one Qdrant collection and report before/after counts.
+    
+    Args:
+        connections: Shared database connections with a Qdrant client
+        collection_name: Collection to index
+        force_rebuild: Whether to force a full index rebuild
+        
+    Returns:
+        Per-collection result dict
+    """
+    qdrant_client = connections.qdrant_client
+    
+    # Get collection status before indexing
+    try:
+        collection_info = await asyncio.to_thread(qdrant_client.get_collection, collection_name)
+        points_before = collection_info.points_count
+        indexed_before = getattr(collection_info, 'indexed_vectors_count', 0)
+    except Exception:
+        return {
+            "success": False,
+            "error": f"Collection '{collection_name}' does not exist"
+        }
+    
+    # Force indexing by dropping the indexing threshold
+    await asyncio.to_thread(
+        qdrant_client.update_collection,
+        collection_name=collection_name,
+        optimizer_config=FORCE_INDEX_OPTIMIZER_CONFIG
+    )
+    
+    # Poll until indexing moves (or everything is already indexed) instead of fixed sleeps
+    deadline = time.monotonic() + INDEX_POLL_MAX_SECONDS
+    poll_interval = INDEX_POLL_INITIAL_INTERVAL_SECONDS
+    collection_info_after = await asyncio.to_thread(qdrant_client.get_collection, collection_name)
+    while time.monotonic() < deadline:
+        indexed_after = getattr(collection_info_after, 'indexed_vectors_count', 0) or 0
+        if indexed_after != indexed_before or indexed_after >= (collection_info_after.points_count or 0):
+            break
+        await asyncio.sleep(poll_interval)
+        poll_interval = min(poll_interval * 2, INDEX_POLL_MAX_INTERVAL_SECONDS)
+        collection_info_after = await asyncio.to_thread(qdrant_client.get_collection, collection_name)
+    
+    if force_rebuild:
+        # Restore default settings once the rebuild has started
+        await asyncio.to_thread(
+            qdrant_client.update_collection,
+            collection_name=collection_name,
+            optimizer_config=DEFAULT_INDEX_OPTIMIZER_CONFIG
+        )
+    
+    points_after = collection_info_after.points_count
+    indexed_after = getattr(collection_info_after, 'indexed_vectors_count', 0)
+    
+    return {
+        "success": True,
+        "before": {
+            "points_count": points_before,
+            "indexed_vectors_count": indexed_before
+        },
+        "after": {
+            "points_count": points_after,
+            "indexed_vectors_count": indexed_after
+        },
+        "indexing_triggered": indexed_after > indexed_before,
+        "force_rebuild": force_rebuild
+    }
 
 @app.post("/qdrant/force-index")
 async def force_qdrant_indexing(request: QdrantIndexRequest):
@@ -207,13 +872,9 @@ async def force_qdrant_indexing(request: QdrantIndexRequest):
     - video_transcript_segments
     - video_scene_descriptions
     """
-    async with semaphore:
+    async with admitted(admin_admission()):
         try:
-            from app.db_connections import DatabaseConnections
-            
-            # Initialize database connections
-            connections = DatabaseConnections()
-            await connections.connect_all()
+            connections = app.state.connections
             
             if not connections.qdrant_client:
                 raise HTTPException(status_code=503, detail="Qdrant client not available")
@@ -222,86 +883,34 @@ async def force_qdrant_indexing(request: QdrantIndexRequest):
             default_collections = ["video_transcript_segments", "video_scene_descriptions"]
             target_collections = request.collections or default_collections
             
-            results = {}
-            overall_success = True
+            # Index all collections concurrently
+            outcomes = await asyncio.gather(
+                *(
+                    asyncio.wait_for(
+                        reindex_collection(connections, collection_name, request.force_rebuild),
+                        timeout=REQUEST_TIMEOUT_SECONDS
+                    )
+                    for collection_name in target_collections
+                ),
+                return_exceptions=True
+            )
             
-            for collection_name in target_collections:
-                try:
-                    # Get collection status before indexing
-                    try:
-                        collection_info = connections.qdrant_client.get_collection(collection_name)
-                        points_before = collection_info.points_count
-                        indexed_before = getattr(collection_info, 'indexed_vectors_count', 0)
-                    except Exception:
-                        results[collection_name] = {
-                            "success": False,
-                            "error": f"Collection '{collection_name}' does not exist"
-                        }
-                        overall_success = False
-                        continue
-                    
-                    # Force indexing by updating collection optimization settings
-                    from qdrant_client.models import OptimizersConfigDiff
-                    
-                    if request.force_rebuild:
-                        # Force full index rebuild by temporarily changing optimization settings
-                        connections.qdrant_client.update_collection(
-                            collection_name=collection_name,
-                            optimizer_config=OptimizersConfigDiff(
-                                indexing_threshold=1  # Force immediate indexing
-                            )
-                        )
-                        
-                        # Wait a moment for the change to take effect
-                        await asyncio.sleep(1)
-                        
-                        # Restore default settings
-                        connections.qdrant_client.update_collection(
-                            collection_name=collection_name,
-                            optimizer_config=OptimizersConfigDiff(
-                                indexing_threshold=20000  # Back to default
-                            )
-                        )
-                    else:
-                        # Trigger optimization which forces indexing
-                        connections.qdrant_client.update_collection(
-                            collection_name=collection_name,
-                            optimizer_config=OptimizersConfigDiff(
-                                indexing_threshold=1  # Force immediate indexing
-                            )
-                        )
-                    
-                    # Wait for indexing to complete
-                    await asyncio.sleep(2)
-                    
-                    # Get collection status after indexing
-                    collection_info_after = connections.qdrant_client.get_collection(collection_name)
-                    points_after = collection_info_after.points_count
-                    indexed_after = getattr(collection_info_after, 'indexed_vectors_count', 0)
-                    
+            results = {}
+            for collection_name, outcome in zip(target_collections, outcomes):
+                if isinstance(outcome, asyncio.TimeoutError):
                     results[collection_name] = {
-                        "success": True,
-                        "before": {
-                            "points_count": points_before,
-                            "indexed_vectors_count": indexed_before
-                        },
-                        "after": {
-                            "points_count": points_after,
-                            "indexed_vectors_count": indexed_after
-                        },
-                        "indexing_triggered": indexed_after > indexed_before,
-                        "force_rebuild": request.force_rebuild
+                        "success": False,
+                        "error": f"Indexing timed out after {REQUEST_TIMEOUT_SECONDS}s"
                     }
-                    
-                except Exception as e:
+                elif isinstance(outcome, Exception):
                     results[collection_name] = {
                         "success": False,
-                        "error": str(e)
+                        "error": str(outcome)
                     }
-                    overall_success = False
+                else:
+                    results[collection_name] = outcome
             
-            # Clean up connections
-            await connections.close_all()
+            overall_success = all(result["success"] for result in results.values())
             
             return {
                 "success": overall_success,
@@ -316,22 +925,94 @@ async def force_qdrant_indexing(request: QdrantIndexRequest):
                 }
             }
             
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Qdrant indexing failed: {str(e)}")
 
+def etag_response(result: Dict, if_none_match: Optional[str], compress: bool = True) -> Response:
+    """
+    Serialize a GET result once and tag it with a weak ETag.
+    
+    Args:
+        result: JSON-serializable response body
+        if_none_match: Value of the client's If-None-Match header
+        compress: Whether GZip may compress the body (off for base64 video payloads)
+        
+    Returns:
+        304 Not Modified if the client already has this body, otherwise the JSON response
+    """
+    response = json_response(result, compress)
+    etag = f'W/"{hashlib.sha1(response.body).hexdigest()}"'
+    
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return response
 
+async def load_result(key: tuple, load: Callable[[], Awaitable[Dict]], cacheable: bool) -> Dict:
+    """Run one read lookup with REQUEST_TIMEOUT_SECONDS and cache a successful result."""
+    # A stuck database or Qdrant call must not hang the request
+    result = await asyncio.wait_for(load(), timeout=REQUEST_TIMEOUT_SECONDS)
+    if cacheable and result["success"]:
+        get_response_cache().set(key, result)
+    return result
 
-
+async def cached_result(key: tuple, load: Callable[[], Awaitable[Dict]], cacheable: bool = True) -> Dict:
+    """
+    Return a read result from the response cache, loading and storing it on a miss.
+    
+    Concurrent misses for the same key share one lookup instead of each
+    querying the database.
+    
+    Args:
+        key: Cache key (endpoint name plus every parameter that changes the result)
+        load: Coroutine factory that fetches the result from the database
+        cacheable: Whether a successful result may be cached (base64 payloads are not)
+        
+    Returns:
+        Result dict from cache or from load()
+        
+    Raises:
+        HTTPException: 504 if load() takes longer than REQUEST_TIMEOUT_SECONDS
+    """
+    if cacheable:
+        result = get_response_cache().get(key)
+        if result is not None:
+            return result
+    
+    job = inflight_reads.get(key)
+    if job is None:
+        job = asyncio.ensure_future(load_result(key, load, cacheable))
+        inflight_reads[key] = job
+        
+        def finish(task: asyncio.Task):
+            inflight_reads.pop(key, None)
+            # Mark the outcome as retrieved even if every caller went away
+            if not task.cancelled():
+                task.exception()
+        
+        job.add_done_callback(finish)
+    
+    try:
+        # Shield so one caller disconnecting doesn't cancel the lookup for the others
+        return await asyncio.shield(job)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"Request timed out after {REQUEST_TIMEOUT_SECONDS}s")
 
 @app.get("/video/{video_id}")
-async def get_video(video_id: str, include_base64: bool = False):
+async def get_video(video_id: str, include_base64: bool = False, if_none_match: Optional[str] = Header(None)):
     """Get video data by ID."""
     try:
-        from app.simple_unified_processor import get_video_simple
-        result = await get_video_simple(video_id, include_base64)
+        result = await cached_result(
+            ("video", video_id, include_base64),
+            lambda: get_video_simple(video_id, include_base64),
+            cacheable=not include_base64
+        )
         
         if result["success"]:
-            return result
+            return etag_response(result, if_none_match, compress=not include_base64)
         else:
             raise HTTPException(status_code=404, detail=result.get("error", "Video not found"))
             
@@ -340,17 +1021,40 @@ async def get_video(video_id: str, include_base64: bool = False):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get video: {str(e)}")
 
-@app.get("/carousel")
-async def get_carousel_by_url(url: str, include_base64: bool = False):
+@app.get("/video/{video_id}/raw")
+async def get_video_raw(video_id: str):
+    """Stream the stored video as MP4 bytes instead of embedding base64 in JSON."""
+    try:
+        stream = await open_video_stream_simple(video_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to open video stream: {str(e)}")
+    
+    if stream is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    # MP4 is already compressed - skip gzip
+    return StreamingResponse(
+        stream,
+        media_type="video/mp4",
+        headers={"Content-Encoding": "identity"}
+    )
+
+@app.get("/carousel", dependencies=[carousel_rate_limit])
+async def get_carousel_by_url(url: HttpUrl, include_base64: bool = False, if_none_match: Optional[str] = Header(None)):
     """Get all videos from a carousel by URL (query parameter)."""
+    url = str(url)
     try:
         if not is_valid_url(url):
-            raise HTTPException(status_code=400, detail="Invalid URL format")
+            raise HTTPException(status_code=400, detail="Unsupported URL - only Instagram, YouTube and TikTok links are accepted")
         
-        result = await get_carousel_videos(url, include_base64)
+        result = await cached_result(
+            ("carousel", normalize_url(url), include_base64),
+            lambda: get_carousel_videos(url, include_base64),
+            cacheable=not include_base64
+        )
         
         if result["success"]:
-            return result
+            return etag_response(result, if_none_match, compress=not include_base64)
         else:
             raise HTTPException(status_code=404, detail=result.get("error", "No videos found"))
             
@@ -359,15 +1063,39 @@ async def get_carousel_by_url(url: str, include_base64: bool = False):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get carousel: {str(e)}")
 
-@app.get("/search")
-async def search_videos(q: str, limit: int = 10):
-    """Search videos by content."""
+async def iter_search_events(q: str, limit: int) -> AsyncIterator[bytes]:
+    """Stream search results as "hit" events, then a final "done" (or "error") event."""
+    count = 0
+    try:
+        async for hit in search_videos_simple_stream(q, limit):
+            count += 1
+            yield sse_event("hit", hit)
+    except Exception as e:
+        logger.error(f"❌ Streaming search failed: {e}")
+        yield sse_event("error", {"error": str(e)})
+        return
+    
+    yield sse_event("done", {"query": q, "count": count})
+
+@app.get("/search", dependencies=[search_rate_limit])
+async def search_videos(q: str = Query(..., min_length=1, max_length=500), limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE), stream: bool = False, if_none_match: Optional[str] = Header(None)):
+    """Search videos by content (stream=true sends each hit as a Server-Sent Event)."""
+    if stream:
+        # Identity encoding keeps gzip from buffering the event stream
+        return StreamingResponse(
+            iter_search_events(q, limit),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "Content-Encoding": "identity"}
+        )
+    
     try:
-        from app.simple_unified_processor import search_videos_simple
-        result = await search_videos_simple(q, limit)
+        result = await cached_result(
+            ("search", q, limit),
+            lambda: search_videos_simple(q, limit)
+        )
         
         if result["success"]:
-            return result
+            return etag_response(result, if_none_match)
         else:
             raise HTTPException(status_code=500, detail=result.get("error", "Search failed"))
             
@@ -377,14 +1105,16 @@ async def search_videos(q: str, limit: int = 10):
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 @app.get("/videos")
-async def list_videos(limit: int = 20):
+async def list_videos(limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE), if_none_match: Optional[str] = Header(None)):
     """List recent videos."""
     try:
-        from app.simple_unified_processor import list_videos_simple
-        result = await list_videos_simple(limit)
+        result = await cached_result(
+            ("videos", limit),
+            lambda: list_videos_simple(limit)
+        )
         
         if result["success"]:
-            return result
+            return etag_response(result, if_none_match)
         else:
             raise HTTPException(status_code=500, detail=result.get("error", "Failed to list videos"))
             
@@ -393,31 +1123,41 @@ async def list_videos(limit: int = 20):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list videos: {str(e)}")
 
+HEALTH_INFO = {
+    "status": "healthy",
+    "version": "2.2.12",
+    "features": {
+        "carousel_support": True,
+        "ai_credit_management": True,
+        "graceful_audio_handling": True,
+        "enhanced_video_context": True,
+        "rate_limiting": True
+    }
+}
+
+# Static part of /health serialized once; only the concurrency stats are encoded per call
+HEALTH_INFO_PREFIX = orjson.dumps(HEALTH_INFO)[:-1] + b',"concurrency":'
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "version": "2.2.12",
-        "features": {
-            "carousel_support": True,
-            "ai_credit_management": True,
-            "graceful_audio_handling": True,
-            "enhanced_video_context": True,
-            "rate_limiting": True
-        }
+    concurrency = {
+        "process": process_admission().get_stats(),
+        "admin": admin_admission().get_stats(),
+        "vectorize": {"limit": 1, "saturated": vectorizer_lock.locked()}
     }
+    return Response(content=HEALTH_INFO_PREFIX + orjson.dumps(concurrency) + b'}', media_type="application/json")
 
 @app.get("/rate-limits")
 async def get_rate_limits():
     """Get current rate limiting status for all AI providers."""
     try:
-        from app.ai_rate_limiter import get_all_usage_stats
         usage_stats = get_all_usage_stats()
         
         return {
             "success": True,
             "providers": usage_stats,
+            "clients": get_all_client_stats(),
             "message": "Rate limiting statistics retrieved successfully"
         }
     except Exception as e:
@@ -427,6 +1167,50 @@ async def get_rate_limits():
             "providers": {}
         }
 
+@app.get("/admin/concurrency")
+async def get_concurrency():
+    """Get the current admission limits and usage."""
+    return {
+        "process": process_admission().get_stats(),
+        "admin": admin_admission().get_stats()
+    }
+
+@app.post("/admin/concurrency")
+async def set_concurrency(request: ConcurrencyRequest, x_admin_token: Optional[str] = Header(None)):
+    """
+    Change admission limits at runtime (this worker only; resets on restart).
+    Lowering a limit never interrupts running requests, it only holds back new ones.
+    Requires ADMIN_TOKEN in the X-Admin-Token header; disabled when ADMIN_TOKEN is unset.
+    The background /process worker count stays at MAX_PROCESS_REQUESTS.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Runtime concurrency changes are disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    if request.process is not None:
+        await process_admission().set_limit(request.process)
+    if request.admin is not None:
+        await admin_admission().set_limit(request.admin)
+    
+    return await get_concurrency()
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8500))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # WEB_CONCURRENCY is the name most process managers/PaaS set
+    workers = int(os.getenv("WORKERS", os.getenv("WEB_CONCURRENCY", 1)))
+    # Optional hard cap on open connections (503 beyond it). It counts keep-alive,
+    # long /process and SSE connections too, so it is off unless LIMIT_CONCURRENCY is set
+    limit_concurrency = int(os.getenv("LIMIT_CONCURRENCY", 0)) or None
+    # Per-request access lines are costly on small endpoints; ACCESS_LOG=0 turns them off
+    access_log = os.getenv("ACCESS_LOG", "1") == "1"
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        limit_concurrency=limit_concurrency,
+        access_log=access_log
+    )
@@ -1,11 +1,16 @@
 import subprocess
 import re
 import os
+import logging
 import cv2
 import numpy as np
 from typing import List, Tuple, Dict, Optional
 import tempfile
 
+from app.utils import run_blocking
+
+logger = logging.getLogger(__name__)
+
 def detect_scenes(video_path: str, threshold: float = 0.22):
     """Basic scene detection - finds scene cuts using FFmpeg."""
     cmd = [
@@ -119,7 +124,7 @@ def calculate_frame_difference(frame1_path: str, frame2_path: str) -> float:
         return normalized_diff
         
     except Exception as e:
-        print(f"Error calculating frame difference: {e}")
+        logger.warning("Error calculating frame difference: %s", e)
         return 0.0
 
 def find_extreme_frames(frames: List[str], max_extremes: int = 4) -> List[Tuple[str, float, str]]:
@@ -191,14 +196,14 @@ def extract_scene_cuts_and_extreme_frames(video_path: str, out_dir: str, thresho
             ]
         }
     """
-    print(f"🎬 Starting enhanced scene detection for: {video_path}")
+    logger.info("🎬 Starting enhanced scene detection for: %s", video_path)
     
     # Step 1: Find scene cuts
     cut_times = detect_scenes(video_path, threshold)
     try:
         duration = get_video_duration(video_path)
     except ValueError as e:
-        print(f"❌ Failed to get video duration: {e}")
+        logger.error("❌ Failed to get video duration: %s", e)
         return []
     
     if not cut_times and duration:
@@ -209,7 +214,7 @@ def extract_scene_cuts_and_extreme_frames(video_path: str, out_dir: str, thresho
         if cut_times[-1] < duration - 1.0:
             cut_times.append(duration)
     
-    print(f"📍 Found {len(cut_times)} scene cut points: {cut_times}")
+    logger.info("📍 Found %d scene cut points: %s", len(cut_times), cut_times)
     
     scenes = []
     
@@ -218,7 +223,7 @@ def extract_scene_cuts_and_extreme_frames(video_path: str, out_dir: str, thresho
         start_time = cut_times[i]
         end_time = cut_times[i + 1]
         
-        print(f"\n🔍 Processing scene {i+1}: {start_time:.2f}s - {end_time:.2f}s")
+        logger.info("🔍 Processing scene %d: %.2fs - %.2fs", i + 1, start_time, end_time)
         
         # Extract frames from this scene
         scene_frames = extract_frames_from_scene(
@@ -226,10 +231,10 @@ def extract_scene_cuts_and_extreme_frames(video_path: str, out_dir: str, thresho
         )
         
         if not scene_frames:
-            print(f"⚠️  No frames extracted for scene {i+1}")
+            logger.warning("⚠️  No frames extracted for scene %d", i + 1)
             continue
         
-        print(f"📸 Extracted {len(scene_frames)} frames for analysis")
+        logger.info("📸 Extracted %d frames for analysis", len(scene_frames))
         
         # Find extreme frames within this scene
         extreme_frames_data = find_extreme_frames(scene_frames, max_extremes=4)
@@ -254,9 +259,9 @@ def extract_scene_cuts_and_extreme_frames(video_path: str, out_dir: str, thresho
                 'frame_type': frame_type
             })
         
-        print(f"🎯 Found {len(extreme_frames)} extreme frames:")
+        logger.info("🎯 Found %d extreme frames:", len(extreme_frames))
         for ef in extreme_frames:
-            print(f"   • {ef['frame_type']}: {ef['timestamp']:.2f}s (diff: {ef['difference_score']:.3f})")
+            logger.info("   • %s: %.2fs (diff: %.3f)", ef['frame_type'], ef['timestamp'], ef['difference_score'])
         
         scenes.append({
             'start_time': start_time,
@@ -264,7 +269,7 @@ def extract_scene_cuts_and_extreme_frames(video_path: str, out_dir: str, thresho
             'extreme_frames': extreme_frames
         })
     
-    print(f"\n✅ Scene detection complete! Found {len(scenes)} scenes with extreme frames")
+    logger.info("✅ Scene detection complete! Found %d scenes with extreme frames", len(scenes))
     return scenes
 
 async def extract_scenes_with_ai_analysis(video_path: str, out_dir: str, threshold: float = 0.22, 
@@ -297,16 +302,16 @@ async def extract_scenes_with_ai_analysis(video_path: str, out_dir: str, thresho
             }
         ]
     """
-    from app.ai_scene_analysis import analyze_all_scenes_with_ai, cleanup_frame_images
+    from app.ai_scene_analysis import analyze_all_scenes_with_ai, cleanup_frame_images, DEFAULT_FITNESS_TAGS
     
     transcript_status = " with transcript" if transcript_data else ""
-    print(f"🎬 Starting complete scene analysis{transcript_status} for: {os.path.basename(video_path)}")
+    logger.info("🎬 Starting complete scene analysis%s for: %s", transcript_status, os.path.basename(video_path))
     
-    # Step 1: Enhanced scene detection with extreme frames
-    scenes_data = extract_scene_cuts_and_extreme_frames(video_path, out_dir, threshold)
+    # Step 1: Enhanced scene detection with extreme frames (ffmpeg/OpenCV work, kept off the event loop)
+    scenes_data = await run_blocking(extract_scene_cuts_and_extreme_frames, video_path, out_dir, threshold)
     
     if not scenes_data:
-        print("❌ No scenes detected")
+        logger.warning("❌ No scenes detected")
         return []
     
     # Step 2: AI analysis (if enabled)
@@ -314,7 +319,7 @@ async def extract_scenes_with_ai_analysis(video_path: str, out_dir: str, thresho
         try:
             analyzed_scenes = await analyze_all_scenes_with_ai(scenes_data, transcript_data, existing_scenes)
         except Exception as e:
-            print(f"⚠️  AI analysis failed: {e}")
+            logger.warning("⚠️  AI analysis failed: %s", e)
             # Continue without AI analysis
             analyzed_scenes = []
             for i, scene in enumerate(scenes_data):
@@ -322,7 +327,7 @@ async def extract_scenes_with_ai_analysis(video_path: str, out_dir: str, thresho
                     "start_time": scene['start_time'],
                     "end_time": scene['end_time'],
                     "ai_description": "AI analysis not available",
-                    "ai_tags": ["exercise", "movement", "mobility", "fitness", "training"],
+                    "ai_tags": list(DEFAULT_FITNESS_TAGS),
                     "analysis_success": False,
                     "has_transcript": bool(transcript_data),
                     "scene_transcript": None
@@ -345,7 +350,7 @@ async def extract_scenes_with_ai_analysis(video_path: str, out_dir: str, thresho
     try:
         await cleanup_frame_images(scenes_data)
     except Exception as e:
-        print(f"⚠️  Frame cleanup failed: {e}")
+        logger.warning("⚠️  Frame cleanup failed: %s", e)
     
     # Step 4: Return clean result (without frame paths)
     clean_scenes = []
@@ -368,10 +373,10 @@ async def extract_scenes_with_ai_analysis(video_path: str, out_dir: str, thresho
     success_count = sum(1 for scene in clean_scenes if scene.get('analysis_success', False))
     transcript_scenes = sum(1 for scene in clean_scenes if scene.get('has_transcript', False))
     
-    print(f"✅ Complete scene analysis finished: {len(clean_scenes)} scenes")
-    print(f"   📈 AI Success: {success_count}/{len(clean_scenes)} scenes")
+    logger.info("✅ Complete scene analysis finished: %d scenes", len(clean_scenes))
+    logger.info("   📈 AI Success: %d/%d scenes", success_count, len(clean_scenes))
     if transcript_data:
-        print(f"   📝 With transcript context: {transcript_scenes}/{len(clean_scenes)} scenes")
+        logger.info("   📝 With transcript context: %d/%d scenes", transcript_scenes, len(clean_scenes))
     
     return clean_scenes
 
@@ -6,16 +6,26 @@ Much cleaner and easier to manage than multi-table complexity
 
 import os
 import json
+import asyncio
 import uuid
 import logging
 import base64
-from typing import Dict, List, Any, Optional
+from collections import Counter
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 from app.db_connections import get_db_connections, DatabaseConnections
 
 logger = logging.getLogger(__name__)
 
+# Base64 characters read per query when streaming a stored video (1 MiB, a multiple of 4)
+VIDEO_STREAM_CHUNK_CHARS = 1024 * 1024
+
+def read_file_base64(path: str) -> str:
+    """Read a file and return its contents base64-encoded (blocking; run in a thread)."""
+    with open(path, 'rb') as f:
+        return base64.b64encode(f.read()).decode('utf-8')
+
 class SimpleVideoDatabase:
     """
     Simplified database operations for video storage.
@@ -66,17 +76,15 @@ class SimpleVideoDatabase:
             return None
         
         try:
-            # Read and encode video
-            with open(video_path, 'rb') as f:
-                video_content = f.read()
-                video_base64 = base64.b64encode(video_content).decode('utf-8')
+            # Read and encode video off the event loop
+            video_base64 = await asyncio.to_thread(read_file_base64, video_path)
             
-            # Prepare data
-            transcript_json = json.dumps(transcript_data) if transcript_data else None
+            # Prepare data (JSONB columns are encoded by the pool's orjson codec)
+            transcript_json = transcript_data if transcript_data else None
             
             # Extract descriptions and tags from scenes
             descriptions = []
-            all_tags = set()
+            tag_counts = Counter()
             
             if scenes_data:
                 for scene in scenes_data:
@@ -94,49 +102,43 @@ class SimpleVideoDatabase:
                     
                     descriptions.append(description_obj)
                     
-                    # Collect tags
+                    # Count tags so the most frequent ones come first
                     scene_tags = scene.get("ai_tags", [])
-                    all_tags.update(scene_tags)
+                    tag_counts.update(scene_tags)
             
-            descriptions_json = json.dumps(descriptions) if descriptions else None
-            tags_array = list(all_tags) if all_tags else None
+            descriptions_json = descriptions if descriptions else None
+            tags_array = [tag for tag, _ in tag_counts.most_common()] or None
             
-            # Convert metadata to JSON string if it's a dict
-            metadata_json = json.dumps(metadata) if metadata else None
+            metadata_json = metadata if metadata else None
             
-            # Get fresh connection and insert
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                video_id = str(uuid.uuid4())
-                
-                insert_query = """
-                INSERT INTO simple_videos (
-                    id, url, carousel_index, video_base64, transcript, descriptions, tags, metadata
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                RETURNING id;
-                """
-                
-                result = await conn.fetchrow(
-                    insert_query,
-                    video_id,
-                    url,
-                    carousel_index,
-                    video_base64,
-                    transcript_json,
-                    descriptions_json,
-                    tags_array,
-                    metadata_json
-                )
-                
-                if result:
-                    logger.info(f"✅ Video saved to database: {video_id} (carousel_index: {carousel_index})")
-                    return str(result['id'])
-                else:
-                    logger.error("❌ Failed to save video - no result returned")
-                    return None
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+            # Insert via the pool (acquires and releases a connection internally)
+            video_id = str(uuid.uuid4())
+            
+            insert_query = """
+            INSERT INTO simple_videos (
+                id, url, carousel_index, video_base64, transcript, descriptions, tags, metadata
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            RETURNING id;
+            """
+            
+            result = await self.connections.pg_pool.fetchrow(
+                insert_query,
+                video_id,
+                url,
+                carousel_index,
+                video_base64,
+                transcript_json,
+                descriptions_json,
+                tags_array,
+                metadata_json
+            )
+            
+            if result:
+                logger.info(f"✅ Video saved to database: {video_id} (carousel_index: {carousel_index})")
+                return str(result['id'])
+            else:
+                logger.error("❌ Failed to save video - no result returned")
+                return None
                 
         except Exception as e:
             logger.error(f"❌ Failed to save video: {e}")
@@ -176,35 +178,30 @@ class SimpleVideoDatabase:
             return None
         
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                query = """
-                SELECT id, url, carousel_index, transcript, descriptions, tags, metadata, created_at, updated_at,
-                       CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video
-                FROM simple_videos 
-                WHERE url = $1 AND carousel_index = $2;
-                """
-                
-                result = await conn.fetchrow(query, url, carousel_index)
-                
-                if result:
-                    return {
-                        "id": str(result["id"]),
-                        "url": result["url"],
-                        "carousel_index": result["carousel_index"],
-                        "transcript": result["transcript"],
-                        "descriptions": result["descriptions"],
-                        "tags": result["tags"],
-                        "metadata": result["metadata"],
-                        "has_video": result["has_video"],
-                        "created_at": result["created_at"],
-                        "updated_at": result["updated_at"]
-                    }
-                else:
-                    return None
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+            query = """
+            SELECT id, url, carousel_index, transcript, descriptions, tags, metadata, created_at, updated_at,
+                   CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video
+            FROM simple_videos 
+            WHERE url = $1 AND carousel_index = $2;
+            """
+            
+            result = await self.connections.pg_pool.fetchrow(query, url, carousel_index)
+            
+            if result:
+                return {
+                    "id": str(result["id"]),
+                    "url": result["url"],
+                    "carousel_index": result["carousel_index"],
+                    "transcript": result["transcript"],
+                    "descriptions": result["descriptions"],
+                    "tags": result["tags"],
+                    "metadata": result["metadata"],
+                    "has_video": result["has_video"],
+                    "created_at": result["created_at"],
+                    "updated_at": result["updated_at"]
+                }
+            else:
+                return None
                 
         except Exception as e:
             logger.error(f"❌ Failed to get video by URL and index: {e}")
@@ -225,56 +222,51 @@ class SimpleVideoDatabase:
             return []
         
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                if include_base64:
-                    query = """
-                    SELECT id, url, carousel_index, video_base64, transcript, descriptions, tags, metadata, 
-                           created_at, updated_at,
-                           CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
-                           length(video_base64) as video_size
-                    FROM simple_videos 
-                    WHERE url = $1
-                    ORDER BY carousel_index;
-                    """
-                else:
-                    query = """
-                    SELECT id, url, carousel_index, transcript, descriptions, tags, metadata, 
-                           created_at, updated_at,
-                           CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
-                           length(video_base64) as video_size
-                    FROM simple_videos 
-                    WHERE url = $1
-                    ORDER BY carousel_index;
-                    """
-                
-                results = await conn.fetch(query, url)
-                
-                videos = []
-                for result in results:
-                    video_data = {
-                        "id": str(result["id"]),
-                        "url": result["url"],
-                        "carousel_index": result["carousel_index"],
-                        "transcript": result["transcript"],
-                        "descriptions": result["descriptions"],
-                        "tags": result["tags"] or [],
-                        "metadata": result["metadata"],
-                        "has_video": result["has_video"],
-                        "video_size": result["video_size"] or 0,
-                        "created_at": result["created_at"].isoformat(),
-                        "updated_at": result["updated_at"].isoformat()
-                    }
-                    
-                    if include_base64 and result["video_base64"]:
-                        video_data["video_base64"] = result["video_base64"]
-                    
-                    videos.append(video_data)
-                
-                return videos
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+            if include_base64:
+                query = """
+                SELECT id, url, carousel_index, video_base64, transcript, descriptions, tags, metadata, 
+                       created_at, updated_at,
+                       CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
+                       length(video_base64) as video_size
+                FROM simple_videos 
+                WHERE url = $1
+                ORDER BY carousel_index;
+                """
+            else:
+                query = """
+                SELECT id, url, carousel_index, transcript, descriptions, tags, metadata, 
+                       created_at, updated_at,
+                       CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
+                       length(video_base64) as video_size
+                FROM simple_videos 
+                WHERE url = $1
+                ORDER BY carousel_index;
+                """
+            
+            results = await self.connections.pg_pool.fetch(query, url)
+            
+            videos = []
+            for result in results:
+                video_data = {
+                    "id": str(result["id"]),
+                    "url": result["url"],
+                    "carousel_index": result["carousel_index"],
+                    "transcript": result["transcript"],
+                    "descriptions": result["descriptions"],
+                    "tags": result["tags"] or [],
+                    "metadata": result["metadata"],
+                    "has_video": result["has_video"],
+                    "video_size": result["video_size"] or 0,
+                    "created_at": result["created_at"].isoformat(),
+                    "updated_at": result["updated_at"].isoformat()
+                }
+                
+                if include_base64 and result["video_base64"]:
+                    video_data["video_base64"] = result["video_base64"]
+                
+                videos.append(video_data)
+            
+            return videos
                 
         except Exception as e:
             logger.error(f"❌ Failed to get videos by URL: {e}")
@@ -308,53 +300,48 @@ class SimpleVideoDatabase:
             return None
         
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                if include_base64:
-                    query = """
-                    SELECT id, url, carousel_index, video_base64, transcript, descriptions, tags, metadata, 
-                           created_at, updated_at,
-                           CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
-                           length(video_base64) as video_size
-                    FROM simple_videos 
-                    WHERE id = $1;
-                    """
-                else:
-                    query = """
-                    SELECT id, url, carousel_index, transcript, descriptions, tags, metadata, 
-                           created_at, updated_at,
-                           CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
-                           length(video_base64) as video_size
-                    FROM simple_videos 
-                    WHERE id = $1;
-                    """
-                
-                result = await conn.fetchrow(query, video_id)
-                
-                if result:
-                    video_data = {
-                        "id": str(result["id"]),
-                        "url": result["url"],
-                        "carousel_index": result["carousel_index"],
-                        "transcript": result["transcript"],
-                        "descriptions": result["descriptions"],
-                        "tags": result["tags"] or [],
-                        "metadata": result["metadata"],
-                        "has_video": result["has_video"],
-                        "video_size": result["video_size"] or 0,
-                        "created_at": result["created_at"].isoformat(),
-                        "updated_at": result["updated_at"].isoformat()
-                    }
-                    
-                    if include_base64 and result["video_base64"]:
-                        video_data["video_base64"] = result["video_base64"]
-                    
-                    return video_data
-                else:
-                    return None
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+            if include_base64:
+                query = """
+                SELECT id, url, carousel_index, video_base64, transcript, descriptions, tags, metadata, 
+                       created_at, updated_at,
+                       CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
+                       length(video_base64) as video_size
+                FROM simple_videos 
+                WHERE id = $1;
+                """
+            else:
+                query = """
+                SELECT id, url, carousel_index, transcript, descriptions, tags, metadata, 
+                       created_at, updated_at,
+                       CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video,
+                       length(video_base64) as video_size
+                FROM simple_videos 
+                WHERE id = $1;
+                """
+            
+            result = await self.connections.pg_pool.fetchrow(query, video_id)
+            
+            if result:
+                video_data = {
+                    "id": str(result["id"]),
+                    "url": result["url"],
+                    "carousel_index": result["carousel_index"],
+                    "transcript": result["transcript"],
+                    "descriptions": result["descriptions"],
+                    "tags": result["tags"] or [],
+                    "metadata": result["metadata"],
+                    "has_video": result["has_video"],
+                    "video_size": result["video_size"] or 0,
+                    "created_at": result["created_at"].isoformat(),
+                    "updated_at": result["updated_at"].isoformat()
+                }
+                
+                if include_base64 and result["video_base64"]:
+                    video_data["video_base64"] = result["video_base64"]
+                
+                return video_data
+            else:
+                return None
                 
         except Exception as e:
             logger.error(f"❌ Failed to get video: {e}")
@@ -374,23 +361,63 @@ class SimpleVideoDatabase:
             return None
         
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                query = "SELECT video_base64 FROM simple_videos WHERE id = $1;"
-                result = await conn.fetchrow(query, video_id)
-                
-                if result and result["video_base64"]:
-                    return result["video_base64"]
-                else:
-                    return None
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+            query = "SELECT video_base64 FROM simple_videos WHERE id = $1;"
+            result = await self.connections.pg_pool.fetchrow(query, video_id)
+            
+            if result and result["video_base64"]:
+                return result["video_base64"]
+            else:
+                return None
                 
         except Exception as e:
             logger.error(f"❌ Failed to get video base64: {e}")
             return None
 
+    async def get_video_base64_length(self, video_id: str) -> Optional[int]:
+        """
+        Get the length of the stored base64 video without fetching it.
+
+        Args:
+            video_id: Video UUID
+
+        Returns:
+            Number of base64 characters if a video is stored, None otherwise
+        """
+        if not await self._ensure_connection():
+            return None
+
+        try:
+            query = "SELECT length(video_base64) AS video_size FROM simple_videos WHERE id = $1;"
+            return await self.connections.pg_pool.fetchval(query, video_id)
+
+        except Exception as e:
+            logger.error(f"❌ Failed to get video base64 length: {e}")
+            return None
+
+    async def iter_video_bytes(self, video_id: str, total_length: int,
+                               chunk_chars: int = VIDEO_STREAM_CHUNK_CHARS) -> AsyncIterator[bytes]:
+        """
+        Stream decoded video bytes by paging through the stored base64 text.
+
+        Only one chunk is held in memory at a time. chunk_chars must be a
+        multiple of 4 so every slice decodes on its own.
+
+        Args:
+            video_id: Video UUID
+            total_length: Length of the stored base64 text (see get_video_base64_length)
+            chunk_chars: Number of base64 characters fetched per query
+
+        Yields:
+            Raw video bytes
+        """
+        query = "SELECT substr(video_base64, $2, $3) FROM simple_videos WHERE id = $1;"
+
+        for offset in range(1, total_length + 1, chunk_chars):
+            chunk = await self.connections.pg_pool.fetchval(query, video_id, offset, chunk_chars)
+            if not chunk:
+                break
+            yield base64.b64decode(chunk)
+
     async def update_vectorization_status(self, video_id: str, vector_info: str, embedding_model: str = "text-embedding-3-small") -> bool:
         """
         Update PostgreSQL with vectorization status after successful Qdrant storage.
@@ -408,27 +435,61 @@ class SimpleVideoDatabase:
             return False
         
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                update_query = """
-                UPDATE simple_videos 
-                SET vectorized_at = NOW(), 
-                    vector_id = $1, 
-                    embedding_model = $2
-                WHERE id = $3;
-                """
-                
-                result = await conn.execute(update_query, vector_info, embedding_model, video_id)
+            update_query = """
+            UPDATE simple_videos 
+            SET vectorized_at = NOW(), 
+                vector_id = $1, 
+                embedding_model = $2
+            WHERE id = $3;
+            """
+            
+            result = await self.connections.pg_pool.execute(update_query, vector_info, embedding_model, video_id)
+            
+            if result == "UPDATE 1":
+                logger.debug(f"✅ Updated vectorization status for video: {video_id} ({vector_info})")
+                return True
+            else:
+                logger.warning(f"⚠️ No rows updated for video: {video_id}")
+                return False
                 
-                if result == "UPDATE 1":
-                    logger.debug(f"✅ Updated vectorization status for video: {video_id} ({vector_info})")
-                    return True
-                else:
-                    logger.warning(f"⚠️ No rows updated for video: {video_id}")
-                    return False
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+        except Exception as e:
+            logger.error(f"❌ Failed to update vectorization status: {e}")
+            return False
+
+    async def update_vectorization_status_many(self, statuses: List[Tuple[str, str]],
+                                               embedding_model: str = "text-embedding-3-small") -> bool:
+        """
+        Update vectorization status for many videos in one round-trip.
+        
+        Args:
+            statuses: (video_id, vector_info) pairs
+            embedding_model: OpenAI model used for embeddings
+            
+        Returns:
+            True if successful, False if failed
+        """
+        if not statuses:
+            return True
+        
+        if not await self._ensure_connection():
+            logger.error("❌ Database connection not available")
+            return False
+        
+        try:
+            update_query = """
+            UPDATE simple_videos 
+            SET vectorized_at = NOW(), 
+                vector_id = $1, 
+                embedding_model = $2
+            WHERE id = $3;
+            """
+            
+            await self.connections.pg_pool.executemany(
+                update_query,
+                [(vector_info, embedding_model, video_id) for video_id, vector_info in statuses]
+            )
+            logger.debug(f"✅ Updated vectorization status for {len(statuses)} videos")
+            return True
                 
         except Exception as e:
             logger.error(f"❌ Failed to update vectorization status: {e}")
@@ -463,9 +524,7 @@ class SimpleVideoDatabase:
             
             # Video base64 update
             if video_path:
-                with open(video_path, 'rb') as f:
-                    video_content = f.read()
-                    video_base64 = base64.b64encode(video_content).decode('utf-8')
+                video_base64 = await asyncio.to_thread(read_file_base64, video_path)
                 param_count += 1
                 updates.append(f"video_base64 = ${param_count}")
                 params.append(video_base64)
@@ -480,7 +539,7 @@ class SimpleVideoDatabase:
             if scenes_data is not None:
                 # Extract descriptions and tags from scenes
                 descriptions = []
-                all_tags = set()
+                tag_counts = Counter()
                 
                 for scene in scenes_data:
                     description_obj = {
@@ -497,9 +556,9 @@ class SimpleVideoDatabase:
                     
                     descriptions.append(description_obj)
                     
-                    # Collect tags
+                    # Count tags so the most frequent ones come first
                     scene_tags = scene.get("ai_tags", [])
-                    all_tags.update(scene_tags)
+                    tag_counts.update(scene_tags)
                 
                 param_count += 1
                 updates.append(f"descriptions = ${param_count}")
@@ -507,13 +566,13 @@ class SimpleVideoDatabase:
                 
                 param_count += 1
                 updates.append(f"tags = ${param_count}")
-                params.append(list(all_tags))
+                params.append([tag for tag, _ in tag_counts.most_common()])
             
             # Metadata update
             if metadata is not None:
                 param_count += 1
                 updates.append(f"metadata = ${param_count}")
-                params.append(json.dumps(metadata))  # Convert to JSON string
+                params.append(metadata)
             
             if not updates:
                 logger.warning("No updates provided")
@@ -531,19 +590,14 @@ class SimpleVideoDatabase:
             RETURNING id;
             """
             
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                result = await conn.fetchrow(update_query, *params)
-                
-                if result:
-                    logger.info(f"✅ Video updated: {video_id}")
-                    return str(result['id'])
-                else:
-                    logger.error(f"❌ Failed to update video: {video_id}")
-                    return None
-                    
-            finally:
-                await self.connections.pg_pool.release(conn)
+            result = await self.connections.pg_pool.fetchrow(update_query, *params)
+            
+            if result:
+                logger.info(f"✅ Video updated: {video_id}")
+                return str(result['id'])
+            else:
+                logger.error(f"❌ Failed to update video: {video_id}")
+                return None
                 
         except Exception as e:
             logger.error(f"❌ Failed to update video: {e}")
@@ -567,81 +621,52 @@ class SimpleVideoDatabase:
             # Fallback to text search if vector search fails
             return await self._search_videos_text(query, limit)
     
+    async def iter_search_videos(self, query: str, limit: int = 10) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield search results one at a time as each video's metadata is loaded.
+
+        Same ranking and text-search fallback as search_videos, but callers can
+        forward each hit without waiting for the PostgreSQL lookups of the rest.
+
+        Args:
+            query: Search text
+            limit: Maximum number of videos to yield
+
+        Yields:
+            Video dicts with search relevance info
+        """
+        if not await self._ensure_connection():
+            return
+        
+        hits = None
+        if self.connections and self.connections.qdrant_client and self.connections.openai_client:
+            try:
+                hits = await self._rank_vector_hits(query, limit)
+            except Exception as e:
+                logger.error(f"❌ Vector search failed: {e}")
+        
+        if hits is None:
+            for result in await self._search_videos_text(query, limit):
+                yield result
+            return
+        
+        for hit in hits:
+            video_data = await self._load_search_hit(hit)
+            if video_data:
+                yield video_data
+    
     async def _search_videos_vector(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search videos using Qdrant vector search."""
         try:
-            # Generate embedding for search query
-            embedding = await self.connections.generate_embedding(query)
-            if not embedding:
-                logger.warning("Failed to generate embedding, falling back to text search")
+            hits = await self._rank_vector_hits(query, limit)
+            if hits is None:
                 return await self._search_videos_text(query, limit)
             
-            # Search both collections
-            collections = ["video_transcript_segments", "video_scene_descriptions"]
-            all_results = []
-            
-            for collection_name in collections:
-                try:
-                    results = self.connections.qdrant_client.search(
-                        collection_name=collection_name,
-                        query_vector=embedding,
-                        limit=limit,
-                        score_threshold=0.3,  # Minimum relevance score
-                        with_payload=True
-                    )
-                    
-                    for result in results:
-                        payload = result.payload
-                        video_id = payload.get("video_id")
-                        
-                        # Skip if no video_id
-                        if not video_id:
-                            continue
-                        
-                        all_results.append({
-                            "video_id": video_id,
-                            "score": float(result.score),
-                            "collection": collection_name,
-                            "text": payload.get("text", payload.get("description", "")),
-                            "type": payload.get("type", "unknown"),
-                            "url": payload.get("url", ""),
-                            "carousel_index": payload.get("carousel_index", 0),
-                            "created_at": payload.get("created_at", "")
-                        })
-                        
-                except Exception as e:
-                    logger.warning(f"Search failed for collection {collection_name}: {e}")
-                    continue
-            
-            # Remove duplicates and sort by score
-            unique_videos = {}
-            for result in all_results:
-                video_id = result["video_id"]
-                if video_id not in unique_videos or result["score"] > unique_videos[video_id]["score"]:
-                    unique_videos[video_id] = result
-            
-            # Sort by relevance score (highest first)
-            sorted_results = sorted(unique_videos.values(), key=lambda x: x["score"], reverse=True)
-            
-            # Limit results
-            limited_results = sorted_results[:limit]
-            
             # Get full video metadata from PostgreSQL for the matched videos
             final_results = []
-            for result in limited_results:
-                video_id = result["video_id"]
-                
-                # Get full video data from PostgreSQL
-                video_data = await self.get_video(video_id, include_base64=False)
-                
+            for hit in hits:
+                video_data = await self._load_search_hit(hit)
                 if video_data:
-                    # Add search relevance info
-                    video_data.update({
-                        "search_score": result["score"],
-                        "matched_text": result["text"][:200],
-                        "match_type": result["type"],
-                        "collection": result["collection"]
-                    })
                     final_results.append(video_data)
             
             logger.info(f"✅ Vector search found {len(final_results)} videos for query: '{query}'")
@@ -651,41 +676,116 @@ class SimpleVideoDatabase:
             logger.error(f"❌ Vector search failed: {e}")
             return await self._search_videos_text(query, limit)
     
+    async def _rank_vector_hits(self, query: str, limit: int = 10) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rank Qdrant matches for a query, keeping the best hit per video.
+        
+        Returns:
+            Up to limit hits sorted by score, or None if no embedding could be generated
+        """
+        # Generate embedding for search query
+        embedding = await self.connections.generate_embedding(query)
+        if not embedding:
+            logger.warning("Failed to generate embedding, falling back to text search")
+            return None
+        
+        # Search both collections
+        collections = ["video_transcript_segments", "video_scene_descriptions"]
+        all_results = []
+        
+        for collection_name in collections:
+            try:
+                # Sync client: keep the HTTP round trip off the event loop
+                results = await asyncio.to_thread(
+                    self.connections.qdrant_client.search,
+                    collection_name=collection_name,
+                    query_vector=embedding,
+                    limit=limit,
+                    score_threshold=0.3,  # Minimum relevance score
+                    with_payload=True
+                )
+                
+                for result in results:
+                    payload = result.payload
+                    video_id = payload.get("video_id")
+                    
+                    # Skip if no video_id
+                    if not video_id:
+                        continue
+                    
+                    all_results.append({
+                        "video_id": video_id,
+                        "score": float(result.score),
+                        "collection": collection_name,
+                        "text": payload.get("text", payload.get("description", "")),
+                        "type": payload.get("type", "unknown"),
+                        "url": payload.get("url", ""),
+                        "carousel_index": payload.get("carousel_index", 0),
+                        "created_at": payload.get("created_at", "")
+                    })
+                    
+            except Exception as e:
+                logger.warning(f"Search failed for collection {collection_name}: {e}")
+                continue
+        
+        # Remove duplicates and sort by score
+        unique_videos = {}
+        for result in all_results:
+            video_id = result["video_id"]
+            if video_id not in unique_videos or result["score"] > unique_videos[video_id]["score"]:
+                unique_videos[video_id] = result
+        
+        # Sort by relevance score (highest first)
+        sorted_results = sorted(unique_videos.values(), key=lambda x: x["score"], reverse=True)
+        
+        # Limit results
+        return sorted_results[:limit]
+    
+    async def _load_search_hit(self, hit: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load a ranked hit's video from PostgreSQL and attach its relevance info."""
+        video_data = await self.get_video(hit["video_id"], include_base64=False)
+        
+        if video_data:
+            # Add search relevance info
+            video_data.update({
+                "search_score": hit["score"],
+                "matched_text": hit["text"][:200],
+                "match_type": hit["type"],
+                "collection": hit["collection"]
+            })
+        return video_data
+    
     async def _search_videos_text(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Fallback PostgreSQL text search."""
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                search_query = """
-                SELECT id, url, carousel_index, tags, metadata, created_at,
-                       descriptions -> 0 ->> 'description' as first_description
-                FROM simple_videos 
-                WHERE 
-                    descriptions::text ILIKE $1 
-                    OR array_to_string(tags, ' ') ILIKE $1
-                    OR metadata::text ILIKE $1
-                    OR url ILIKE $1
-                ORDER BY created_at DESC
-                LIMIT $2;
-                """
-                
-                search_term = f"%{query}%"
-                results = await conn.fetch(search_query, search_term, limit)
-                
-                return [
-                    {
-                        "id": str(row["id"]),
-                        "url": row["url"],
-                        "carousel_index": row["carousel_index"],
-                        "tags": row["tags"] or [],
-                        "first_description": row["first_description"],
-                        "created_at": row["created_at"].isoformat(),
-                        "search_method": "text"
-                    }
-                    for row in results
-                ]
-            finally:
-                await self.connections.pg_pool.release(conn)
+            search_query = """
+            SELECT id, url, carousel_index, tags, metadata, created_at,
+                   descriptions -> 0 ->> 'description' as first_description
+            FROM simple_videos 
+            WHERE 
+                descriptions::text ILIKE $1 
+                OR array_to_string(tags, ' ') ILIKE $1
+                OR metadata::text ILIKE $1
+                OR url ILIKE $1
+            ORDER BY created_at DESC
+            LIMIT $2;
+            """
+            
+            search_term = f"%{query}%"
+            results = await self.connections.pg_pool.fetch(search_query, search_term, limit)
+            
+            return [
+                {
+                    "id": str(row["id"]),
+                    "url": row["url"],
+                    "carousel_index": row["carousel_index"],
+                    "tags": row["tags"] or [],
+                    "first_description": row["first_description"],
+                    "created_at": row["created_at"].isoformat(),
+                    "search_method": "text"
+                }
+                for row in results
+            ]
                 
         except Exception as e:
             logger.error(f"❌ Text search failed: {e}")
@@ -697,33 +797,29 @@ class SimpleVideoDatabase:
             return []
         
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                query = """
-                SELECT id, url, carousel_index, tags, created_at,
-                       descriptions -> 0 ->> 'description' as first_description,
-                       CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video
-                FROM simple_videos 
-                ORDER BY created_at DESC
-                LIMIT $1;
-                """
-                
-                results = await conn.fetch(query, limit)
-                
-                return [
-                    {
-                        "id": str(row["id"]),
-                        "url": row["url"],
-                        "carousel_index": row["carousel_index"],
-                        "tags": row["tags"] or [],
-                        "first_description": row["first_description"],
-                        "has_video": row["has_video"],
-                        "created_at": row["created_at"].isoformat()
-                    }
-                    for row in results
-                ]
-            finally:
-                await self.connections.pg_pool.release(conn)
+            query = """
+            SELECT id, url, carousel_index, tags, created_at,
+                   descriptions -> 0 ->> 'description' as first_description,
+                   CASE WHEN video_base64 IS NOT NULL THEN true ELSE false END as has_video
+            FROM simple_videos 
+            ORDER BY created_at DESC
+            LIMIT $1;
+            """
+            
+            results = await self.connections.pg_pool.fetch(query, limit)
+            
+            return [
+                {
+                    "id": str(row["id"]),
+                    "url": row["url"],
+                    "carousel_index": row["carousel_index"],
+                    "tags": row["tags"] or [],
+                    "first_description": row["first_description"],
+                    "has_video": row["has_video"],
+                    "created_at": row["created_at"].isoformat()
+                }
+                for row in results
+            ]
                 
         except Exception as e:
             logger.error(f"❌ Failed to list videos: {e}")
@@ -9,18 +9,51 @@ import json
 import logging
 import asyncio
 import base64
-from typing import Dict, List, Any, Optional
+import shutil
+from collections import Counter
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Any, Optional
 from pathlib import Path
 from datetime import datetime
+import yt_dlp
 
 from app.downloaders import download_media_and_metadata
 from app.transcription import transcribe_audio
 from app.scene_detection import extract_scenes_with_ai_analysis
 from app.simple_db_operations import SimpleVideoDatabase
+from app.utils import run_blocking
 # Utils not needed for simplified approach
 
 logger = logging.getLogger(__name__)
 
+# Carousel videos processed concurrently per request (each may run Whisper and AI scene analysis)
+CAROUSEL_CONCURRENCY = int(os.getenv("CAROUSEL_CONCURRENCY", 2))
+
+class ProcessingError(Exception):
+    """Expected pipeline failure that maps to an HTTP status code."""
+    
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+def download_error(error: Exception) -> ProcessingError:
+    """
+    Map an upstream download failure to a ProcessingError.
+    
+    Args:
+        error: Exception raised by the downloader (e.g. yt-dlp DownloadError)
+        
+    Returns:
+        ProcessingError with 429 (rate limited), 404 (missing/private) or 502 (other upstream failure)
+    """
+    message = str(error)
+    lowered = message.lower()
+    if "429" in message or "too many requests" in lowered or "rate-limit" in lowered:
+        return ProcessingError(f"Source rate limited the download: {message}", status_code=429)
+    if "404" in message or "not found" in lowered or "unavailable" in lowered or "private" in lowered:
+        return ProcessingError(f"Source media not found or not accessible: {message}", status_code=404)
+    return ProcessingError(f"Download failed: {message}", status_code=502)
+
 def normalize_url(url: str) -> str:
     """
     Normalize URL by removing img_index and other carousel-specific parameters.
@@ -47,7 +80,8 @@ async def process_video_unified_simple(
     describe: bool = True,
     save_to_postgres: bool = True,
     save_to_qdrant: bool = True,
-    include_base64: bool = False
+    include_base64: bool = False,
+    on_video: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
 ) -> Dict[str, Any]:
     """
     Simplified unified video processing with carousel support.
@@ -60,6 +94,7 @@ async def process_video_unified_simple(
         save_to_postgres: Whether to save to PostgreSQL database
         save_to_qdrant: Whether to save to Qdrant vector database
         include_base64: Whether to include base64 in response (warning: large!)
+        on_video: Optional coroutine called with each video's result as soon as it is ready
         
     Returns:
         Unified response with all processing results
@@ -80,24 +115,20 @@ async def process_video_unified_simple(
         
         # Download all videos from URL (handles carousels automatically)
         logger.info(f"📥 Downloading media from: {url}")
-        download_result = await download_media_and_metadata(url)
+        try:
+            download_result = await download_media_and_metadata(url)
+        except yt_dlp.utils.DownloadError as e:
+            raise download_error(e)
         
         # Get all video files from download
         video_files = [f for f in download_result['files'] if f.lower().endswith(('.mp4', '.mkv', '.webm'))]
         if not video_files:
-            return {
-                "success": False,
-                "error": "No video files found after download",
-                "url": url
-            }
+            raise ProcessingError("No video files found after download", status_code=404)
         
         logger.info(f"✅ Found {len(video_files)} video(s) to process")
         
-        # Process each video in the carousel
-        processed_videos = []
-        all_video_ids = []
-        
-        for carousel_index, video_path in enumerate(video_files):
+        async def process_carousel_video(carousel_index: int, video_path: str) -> Dict[str, Any]:
+            """Process one carousel video and return its result entry."""
             logger.info(f"🎬 Processing video {carousel_index + 1}/{len(video_files)}: {os.path.basename(video_path)}")
             
             # Check if this specific carousel video already exists
@@ -119,7 +150,7 @@ async def process_video_unified_simple(
                         if (not save_video or has_video) and (not transcribe or has_transcript) and (not describe or has_descriptions):
                             logger.info(f"💰 Carousel video {carousel_index} already fully processed - AI credits saved!")
                             
-                            processed_videos.append({
+                            video_result = {
                                 "carousel_index": carousel_index,
                                 "video_id": existing_video["id"],
                                 "processing": {
@@ -137,9 +168,8 @@ async def process_video_unified_simple(
                                     "qdrant_saved": False,  # We'd need to check Qdrant too
                                     "video_stored": has_video
                                 }
-                            })
-                            all_video_ids.append(existing_video["id"])
-                            continue
+                            }
+                            return video_result
                         
                         # Update processing flags based on what we already have
                         current_save_video = save_video and not has_video
@@ -176,7 +206,7 @@ async def process_video_unified_simple(
             # Transcription
             if current_transcribe:
                 logger.info(f"🎤 Starting transcription for video {carousel_index}...")
-                transcript_data = await asyncio.to_thread(transcribe_audio, video_path)
+                transcript_data = await run_blocking(transcribe_audio, video_path)
                 
                 if transcript_data:
                     logger.info(f"✅ Transcription completed for video {carousel_index}: {len(transcript_data)} segments")
@@ -418,7 +448,8 @@ async def process_video_unified_simple(
                 logger.warning(f"⚠️ OpenAI client not available for embeddings for video {carousel_index}")
             
             # Prepare response for this video
-            all_tags = set()
+            # Tags are counted so they come out most frequent first, like the stored tags
+            all_tags = Counter()
             final_transcript_data = transcript_data
             final_scenes_data = scenes_data
             
@@ -454,7 +485,7 @@ async def process_video_unified_simple(
                 "results": {
                     "transcript_data": final_transcript_data,
                     "scenes_data": final_scenes_data,
-                    "tags": list(all_tags)
+                    "tags": [tag for tag, _ in all_tags.most_common()]
                 },
                 "database": {
                     "postgres_saved": bool(video_id),
@@ -471,9 +502,29 @@ async def process_video_unified_simple(
                 except Exception as e:
                     logger.warning(f"Failed to get video base64 for video {carousel_index}: {e}")
             
-            processed_videos.append(video_result)
-            if video_id:
-                all_video_ids.append(video_id)
+            return video_result
+        
+        # Carousel videos are independent; run a few at a time instead of one after another
+        carousel_slots = asyncio.Semaphore(CAROUSEL_CONCURRENCY)
+        
+        async def process_in_slot(carousel_index: int, video_path: str) -> Dict[str, Any]:
+            async with carousel_slots:
+                video_result = await process_carousel_video(carousel_index, video_path)
+            if on_video:
+                await on_video(video_result)
+            return video_result
+        
+        # Let every video finish before failing so none is still running when temp files are removed
+        outcomes = await asyncio.gather(
+            *(process_in_slot(carousel_index, video_path) for carousel_index, video_path in enumerate(video_files)),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        
+        processed_videos = list(outcomes)
+        all_video_ids = [video["video_id"] for video in processed_videos if video["video_id"]]
         
         # Prepare final response
         is_carousel = len(video_files) > 1
@@ -508,6 +559,16 @@ async def process_video_unified_simple(
         
         return response
         
+    except ProcessingError as e:
+        # Expected failure (missing post, rate limit) - no traceback needed
+        logger.warning(f"⚠️ Processing failed ({e.status_code}): {e.message}")
+        return {
+            "success": False,
+            "error": e.message,
+            "status_code": e.status_code,
+            "url": url
+        }
+    
     except Exception as e:
         logger.error(f"❌ Processing failed: {e}", exc_info=True)
         return {
@@ -520,8 +581,7 @@ async def process_video_unified_simple(
         # Cleanup temp files
         try:
             if download_result and download_result.get('temp_dir'):
-                import shutil
-                shutil.rmtree(download_result['temp_dir'], ignore_errors=True)
+                await asyncio.to_thread(shutil.rmtree, download_result['temp_dir'], ignore_errors=True)
         except:
             pass
 
@@ -666,7 +726,7 @@ async def process_video_unified_full(
             # Transcription
             if current_transcribe:
                 logger.info(f"🎤 Starting transcription for video {carousel_index}...")
-                transcript_data = await asyncio.to_thread(transcribe_audio, video_path)
+                transcript_data = await run_blocking(transcribe_audio, video_path)
                 
                 if transcript_data:
                     logger.info(f"✅ Transcription completed for video {carousel_index}: {len(transcript_data)} segments")
@@ -911,7 +971,8 @@ async def process_video_unified_full(
                 logger.warning(f"⚠️ Qdrant client not available for video {carousel_index}")
             
             # Prepare response for this video
-            all_tags = set()
+            # Tags are counted so they come out most frequent first, like the stored tags
+            all_tags = Counter()
             final_transcript_data = transcript_data
             final_scenes_data = scenes_data
             
@@ -948,7 +1009,7 @@ async def process_video_unified_full(
                 "results": {
                     "transcript_data": final_transcript_data,
                     "scenes_data": final_scenes_data,
-                    "tags": list(all_tags)
+                    "tags": [tag for tag, _ in all_tags.most_common()]
                 },
                 "database": {
                     "postgres_saved": postgres_saved or bool(existing_video),
@@ -1014,11 +1075,108 @@ async def process_video_unified_full(
         # Cleanup temp files
         try:
             if download_result and download_result.get('temp_dir'):
-                import shutil
-                shutil.rmtree(download_result['temp_dir'], ignore_errors=True)
+                await asyncio.to_thread(shutil.rmtree, download_result['temp_dir'], ignore_errors=True)
         except:
             pass
 
+async def get_processed_result_simple(
+    url: str,
+    save_video: bool = True,
+    transcribe: bool = True,
+    describe: bool = True
+) -> Optional[Dict[str, Any]]:
+    """
+    Cheap "already processed" lookup that runs before any download.
+    
+    Only hits when every video of the post is stored and already has
+    everything the flags ask for.
+    
+    Args:
+        url: Video URL (normalized internally)
+        save_video: Whether the caller wants the video stored
+        transcribe: Whether the caller wants a transcript
+        describe: Whether the caller wants scene descriptions
+        
+    Returns:
+        Response in the process_video_unified_simple shape, or None if processing is needed
+    """
+    try:
+        db = SimpleVideoDatabase()
+        await db.initialize()
+        
+        normalized_url = normalize_url(url)
+        videos = await db.get_videos_by_url(normalized_url)
+        if not videos:
+            return None
+        
+        # Carousel size is recorded on save; without it we can't tell if the post is complete
+        metadata = videos[0].get("metadata")
+        if not isinstance(metadata, dict):
+            return None
+        total_videos = metadata.get("carousel_info", {}).get("total_videos")
+        if total_videos != len(videos):
+            return None
+        
+        processed_videos = []
+        for video in videos:
+            has_video = video["has_video"]
+            has_transcript = bool(video.get("transcript"))
+            has_descriptions = bool(video.get("descriptions"))
+            if (save_video and not has_video) or (transcribe and not has_transcript) or (describe and not has_descriptions):
+                return None
+            
+            processed_videos.append({
+                "carousel_index": video["carousel_index"],
+                "video_id": video["id"],
+                "processing": {
+                    "ai_credits_saved": True,
+                    "transcription": has_transcript,
+                    "scene_analysis": has_descriptions
+                },
+                "results": {
+                    "transcript_data": video.get("transcript"),
+                    "scenes_data": video.get("descriptions"),
+                    "tags": video.get("tags", [])
+                },
+                "database": {
+                    "postgres_saved": True,
+                    "qdrant_saved": False,  # We'd need to check Qdrant too
+                    "video_stored": has_video
+                }
+            })
+        
+        logger.info(f"💰 {normalized_url} already fully processed - skipped download and AI analysis")
+        
+        is_carousel = len(processed_videos) > 1
+        return {
+            "success": True,
+            "message": f"{'Carousel' if is_carousel else 'Video'} already processed",
+            "url": url,
+            "normalized_url": normalized_url,
+            "carousel_info": {
+                "is_carousel": is_carousel,
+                "total_videos": len(processed_videos),
+                "processed_videos": len(processed_videos)
+            },
+            "processing": {
+                "download": False,
+                "total_videos_processed": len(processed_videos),
+                "ai_credits_saved_count": len(processed_videos),
+                "database_operations": {
+                    "postgres_enabled": True,
+                    "qdrant_enabled": False,
+                    "postgres_saves": 0,
+                    "qdrant_saves": 0
+                }
+            },
+            "videos": processed_videos,
+            "video_ids": [video["video_id"] for video in processed_videos]
+        }
+        
+    except Exception as e:
+        logger.warning(f"Failed to check for existing processed result: {e}")
+        return None
+
 async def get_video_simple(video_id: str, include_base64: bool = False) -> Dict[str, Any]:
     """Get video data by ID from simple table."""
     try:
@@ -1044,6 +1202,25 @@ async def get_video_simple(video_id: str, include_base64: bool = False) -> Dict[
             "error": str(e)
         }
 
+async def open_video_stream_simple(video_id: str) -> Optional[AsyncIterator[bytes]]:
+    """
+    Open a raw byte stream for a stored video.
+    
+    Args:
+        video_id: Video UUID
+        
+    Returns:
+        Async iterator of MP4 bytes, or None if no video is stored for this ID
+    """
+    db = SimpleVideoDatabase()
+    await db.initialize()
+    
+    total_length = await db.get_video_base64_length(video_id)
+    if not total_length:
+        return None
+    
+    return db.iter_video_bytes(video_id, total_length)
+
 async def get_carousel_videos(url: str, include_base64: bool = False) -> Dict[str, Any]:
     """Get all videos from a carousel by URL."""
     try:
@@ -1155,6 +1332,13 @@ async def search_videos_simple(query: str, limit: int = 10) -> Dict[str, Any]:
             "error": str(e)
         }
 
+async def search_videos_simple_stream(query: str, limit: int = 10) -> AsyncIterator[Dict[str, Any]]:
+    """Yield search results from simple table one at a time as they are loaded."""
+    db = SimpleVideoDatabase()
+    await db.initialize()
+    async for result in db.iter_search_videos(query, limit):
+        yield result
+
 async def list_videos_simple(limit: int = 20) -> Dict[str, Any]:
     """List recent videos from simple table."""
     try:
@@ -4,10 +4,13 @@ import os
 import subprocess
 import sys
 import base64
+import logging
 import tempfile
 from typing import List, Dict
 from dataclasses import dataclass
 
+logger = logging.getLogger(__name__)
+
 @dataclass
 class SceneInput:
     video: str  # base64 string
@@ -181,13 +184,13 @@ def stitch_scenes_to_base64(scenes: List[SceneInput]) -> str:
         try:
             # Process each scene
             scene_files = []
-            print(f"Processing {len(scenes)} scenes...")
+            logger.info("Processing %d scenes...", len(scenes))
             
             for i, scene in enumerate(scenes):
-                print(f"Processing scene {i+1}/{len(scenes)}")
+                logger.info("Processing scene %d/%d", i + 1, len(scenes))
                 scene_file = process_scene(scene, temp_dir, i)  # Pass scene index
                 scene_files.append(scene_file)
-                print(f"Scene {i+1} processed: {scene_file}")
+                logger.info("Scene %d processed: %s", i + 1, scene_file)
             
             if not scene_files:
                 raise ValueError("No valid scenes to process")
@@ -198,10 +201,10 @@ def stitch_scenes_to_base64(scenes: List[SceneInput]) -> str:
                 for scene in scene_files:
                     f.write(f"file '{scene}'\n")
             
-            # Debug: Print concat file contents
-            print("\nConcat file contents:")
-            with open(concat_file, 'r') as f:
-                print(f.read())
+            # Debug: Log concat file contents
+            if logger.isEnabledFor(logging.DEBUG):
+                with open(concat_file, 'r') as f:
+                    logger.debug("Concat file contents:\n%s", f.read())
             
             # Final output path
             output_path = os.path.join(temp_dir, 'final.mp4')
@@ -215,7 +218,7 @@ def stitch_scenes_to_base64(scenes: List[SceneInput]) -> str:
                 '-c', 'copy',
                 output_path
             ]
-            print(f"\nRunning ffmpeg command: {' '.join(cmd)}")  # Debug log
+            logger.debug("Running ffmpeg command: %s", ' '.join(cmd))
             subprocess.run(cmd, check=True)
             
             # Read the final file and convert to base64
@@ -224,7 +227,7 @@ def stitch_scenes_to_base64(scenes: List[SceneInput]) -> str:
                 return base64.b64encode(video_bytes).decode('utf-8')
                 
         except Exception as e:
-            print(f"Error in stitch_scenes_to_base64: {e}")
+            logger.exception("Error in stitch_scenes_to_base64")
             raise
 
 def stitch_scenes_from_json(json_path: str) -> str:
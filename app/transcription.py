@@ -2,10 +2,28 @@ import whisper
 import logging
 import subprocess
 import os
+import threading
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
+# Transcriptions running at once per process; carousel videos run in parallel, and each
+# transcription holds a lot of memory on top of the shared model
+WHISPER_CONCURRENCY = int(os.getenv("WHISPER_CONCURRENCY", 1))
+
+# Whisper models are loaded once per process and shared across transcriptions
+_whisper_models = {}
+_whisper_models_lock = threading.Lock()
+_whisper_slots = threading.BoundedSemaphore(max(1, WHISPER_CONCURRENCY))
+
+def get_whisper_model(model_size: str = 'base'):
+    """Get the shared Whisper model for model_size, loading it on first use."""
+    with _whisper_models_lock:
+        if model_size not in _whisper_models:
+            logger.info(f"📦 Loading Whisper model: {model_size}")
+            _whisper_models[model_size] = whisper.load_model(model_size)
+        return _whisper_models[model_size]
+
 def _check_audio_stream(video_path: str) -> bool:
     """Check if video file has an audio stream."""
     try:
@@ -29,8 +47,9 @@ def transcribe_audio(audio_path: str, model_size: str = 'base'):
         return []
     
     try:
-        model = whisper.load_model(model_size)
-        result = model.transcribe(audio_path)
+        model = get_whisper_model(model_size)
+        with _whisper_slots:
+            result = model.transcribe(audio_path)
     except Exception as e:
         logger.error(f"❌ Transcription failed: {e}")
         if "Failed to load audio" in str(e) or "does not contain any stream" in str(e):
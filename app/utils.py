@@ -1,6 +1,11 @@
+import asyncio
 import unicodedata
 import re
 import string
+from functools import lru_cache
+from typing import Any, Callable
+
+SUPPORTED_DOMAINS = ('instagram.com', 'youtube.com', 'youtu.be', 'tiktok.com')
 
 def clean_text(text: str):
     text = unicodedata.normalize('NFKC', text)
@@ -8,8 +13,37 @@ def clean_text(text: str):
     text = ''.join(c for c in text if c in string.printable)
     return text.strip()
 
+@lru_cache(maxsize=4096)
 def is_valid_url(url: str) -> bool:
     url = url.lower()
-    return any(domain in url for domain in [
-        'instagram.com', 'youtube.com', 'youtu.be', 'tiktok.com'
-    ])
+    return any(domain in url for domain in SUPPORTED_DOMAINS)
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run blocking pipeline work in a worker thread that outlives cancellation safely.
+    
+    asyncio.to_thread can't stop a running thread, so a cancelled caller would otherwise
+    release its processing slot and remove temp files while Whisper or ffmpeg still uses
+    them. Here cancellation waits for the thread to finish, then propagates, so the
+    pipeline stops between steps instead.
+    
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Passed to func
+        
+    Returns:
+        func's return value
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        while not future.done():
+            try:
+                await asyncio.wait({future})
+            except asyncio.CancelledError:
+                pass
+        if not future.cancelled():
+            # The run is being cancelled; the thread's outcome is no longer needed
+            future.exception()
+        raise
@@ -18,6 +18,19 @@ from app.simple_db_operations import SimpleVideoDatabase
 # Setup logging
 logger = logging.getLogger(__name__)
 
+TRANSCRIPT_COLLECTION = "video_transcript_segments"
+SCENE_COLLECTION = "video_scene_descriptions"
+DEFAULT_BATCH_SIZE = 64
+
+def vector_point_id(video_id: Any, collection_name: str, index: int) -> str:
+    """
+    Deterministic Qdrant point ID for one segment/scene of a video.
+    
+    Re-vectorizing a video (e.g. after a failed batch) overwrites its points
+    instead of adding duplicates.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"gilgamesh:{collection_name}:{video_id}:{index}"))
+
 class VectorizeExistingVideos:
     """Class to handle vectorizing existing videos that haven't been vectorized."""
     
@@ -57,44 +70,141 @@ class VectorizeExistingVideos:
             List of video records that need vectorization
         """
         try:
-            conn = await self.connections.pg_pool.acquire()
-            try:
-                query = """
-                SELECT id, url, carousel_index, transcript, descriptions, tags, created_at
-                FROM simple_videos 
-                WHERE vectorized_at IS NULL 
-                AND (transcript IS NOT NULL OR descriptions IS NOT NULL)
-                ORDER BY created_at DESC
-                """
-                
-                if limit:
-                    query += f" LIMIT {limit}"
-                
-                rows = await conn.fetch(query)
-                
-                videos = []
-                for row in rows:
-                    video_data = {
-                        "id": row["id"],
-                        "url": row["url"],
-                        "carousel_index": row["carousel_index"],
-                        "transcript": row["transcript"],
-                        "descriptions": row["descriptions"],
-                        "tags": row["tags"],
-                        "created_at": row["created_at"]
-                    }
-                    videos.append(video_data)
-                
-                logger.info(f"📊 Found {len(videos)} videos that need vectorization")
-                return videos
-                
-            finally:
-                await self.connections.pg_pool.release(conn)
+            query = """
+            SELECT id, url, carousel_index, transcript, descriptions, tags, created_at
+            FROM simple_videos 
+            WHERE vectorized_at IS NULL 
+            AND (transcript IS NOT NULL OR descriptions IS NOT NULL)
+            ORDER BY created_at DESC
+            """
+            
+            if limit:
+                query += f" LIMIT {limit}"
+            
+            rows = await self.connections.pg_pool.fetch(query)
+            
+            videos = []
+            for row in rows:
+                video_data = {
+                    "id": row["id"],
+                    "url": row["url"],
+                    "carousel_index": row["carousel_index"],
+                    "transcript": row["transcript"],
+                    "descriptions": row["descriptions"],
+                    "tags": row["tags"],
+                    "created_at": row["created_at"]
+                }
+                videos.append(video_data)
+            
+            logger.info(f"📊 Found {len(videos)} videos that need vectorization")
+            return videos
                 
         except Exception as e:
             logger.error(f"❌ Failed to get unvectorized videos: {e}")
             return []
     
+    async def ensure_collections(self):
+        """Make sure the transcript and scene collections exist."""
+        await self.connections.ensure_collection_exists(TRANSCRIPT_COLLECTION)
+        await self.connections.ensure_collection_exists(SCENE_COLLECTION)
+    
+    async def build_video_vectors(self, video: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Generate embeddings for each transcript segment and scene description of a video.
+        
+        Args:
+            video: Video record from database
+            
+        Returns:
+            Vectors ready for store_vectors, keyed by collection name
+        """
+        video_id = video["id"]
+        carousel_index = video.get("carousel_index", 0)
+        vectors = {TRANSCRIPT_COLLECTION: [], SCENE_COLLECTION: []}
+        
+        # Process transcript segments individually
+        if video.get("transcript"):
+            transcript_data = video["transcript"]
+            if isinstance(transcript_data, str):
+                try:
+                    transcript_data = json.loads(transcript_data)
+                except json.JSONDecodeError:
+                    transcript_data = []
+            
+            if isinstance(transcript_data, list):
+                for segment_index, segment in enumerate(transcript_data):
+                    if isinstance(segment, dict):
+                        text = segment.get('text', '')
+                        if text:
+                            # Generate embedding for this segment only
+                            embedding = await self.connections.generate_embedding(text)
+                            if embedding:
+                                # Prepare metadata for this transcript segment
+                                segment_metadata = {
+                                    "video_id": video_id,
+                                    "segment_index": segment_index,
+                                    "text": text,
+                                    "start": segment.get('start', 0),
+                                    "end": segment.get('end', 0),
+                                    "duration": segment.get('duration', 0),
+                                    "url": video["url"],
+                                    "carousel_index": carousel_index,
+                                    "type": "transcript_segment",
+                                    "tags": [],  # Individual segments don't have tags
+                                    "created_at": str(video["created_at"]),
+                                    "vectorized_at": str(datetime.now())
+                                }
+                                
+                                # Vector ID must be a UUID
+                                vectors[TRANSCRIPT_COLLECTION].append({
+                                    "id": vector_point_id(video_id, TRANSCRIPT_COLLECTION, segment_index),
+                                    "embedding": embedding,
+                                    "metadata": segment_metadata
+                                })
+        
+        # Process scene descriptions individually  
+        if video.get("descriptions"):
+            descriptions_data = video["descriptions"]
+            if isinstance(descriptions_data, str):
+                try:
+                    descriptions_data = json.loads(descriptions_data)
+                except json.JSONDecodeError:
+                    descriptions_data = []
+            
+            if isinstance(descriptions_data, list):
+                for scene_index, scene in enumerate(descriptions_data):
+                    if isinstance(scene, dict):
+                        # Try both field names for backward compatibility
+                        desc = scene.get('ai_description', '') or scene.get('description', '')
+                        if desc:
+                            # Generate embedding for this scene only
+                            embedding = await self.connections.generate_embedding(desc)
+                            if embedding:
+                                # Prepare metadata for this scene description
+                                scene_metadata = {
+                                    "video_id": video_id,
+                                    "scene_index": scene_index,
+                                    "description": desc,
+                                    "start_time": scene.get('start_time', 0),
+                                    "end_time": scene.get('end_time', 0),
+                                    "duration": scene.get('duration', 0),
+                                    "frame_count": scene.get('frame_count', 0),
+                                    "url": video["url"],
+                                    "carousel_index": carousel_index,
+                                    "type": "scene_description",
+                                    "tags": scene.get('ai_tags', []) or scene.get('tags', []),
+                                    "created_at": str(video["created_at"]),
+                                    "vectorized_at": str(datetime.now())
+                                }
+                                
+                                vectors[SCENE_COLLECTION].append({
+                                    "id": vector_point_id(video_id, SCENE_COLLECTION, scene_index),
+                                    "embedding": embedding,
+                                    "metadata": scene_metadata
+                                })
+        
+        return vectors
+    
     async def vectorize_video(self, video: Dict[str, Any]) -> bool:
         """
         Vectorize a single video by creating individual vectors for each transcript segment and scene description.
@@ -105,144 +215,85 @@ class VectorizeExistingVideos:
         Returns:
             True if successful, False otherwise
         """
-        video_id = video["id"]
-        carousel_index = video.get("carousel_index", 0)
+        return await self.vectorize_batch([video]) == 1
+    
+    async def vectorize_batch(self, videos: List[Dict[str, Any]]) -> int:
+        """
+        Vectorize a batch of videos with one Qdrant upsert per collection
+        and one PostgreSQL status update for the whole batch.
+        
+        If one collection fails to store, videos with points in it are left
+        unvectorized (their deterministic point IDs make the retry overwrite
+        rather than duplicate) while the other videos are still recorded.
         
+        Args:
+            videos: Video records from database
+            
+        Returns:
+            Number of videos successfully vectorized
+        """
         try:
-            # Ensure collections exist
-            transcript_collection = "video_transcript_segments"
-            scene_collection = "video_scene_descriptions"
-            await self.connections.ensure_collection_exists(transcript_collection)
-            await self.connections.ensure_collection_exists(scene_collection)
+            await self.ensure_collections()
             
-            vectors_created = 0
-            vector_ids = []
+            batch_vectors = {TRANSCRIPT_COLLECTION: [], SCENE_COLLECTION: []}
+            statuses = []
+            video_collections = {}
             
-            # Process transcript segments individually
-            if video.get("transcript"):
-                transcript_data = video["transcript"]
-                if isinstance(transcript_data, str):
-                    try:
-                        transcript_data = json.loads(transcript_data)
-                    except json.JSONDecodeError:
-                        transcript_data = []
+            for video in videos:
+                video_id = video["id"]
+                try:
+                    vectors = await self.build_video_vectors(video)
+                except Exception as e:
+                    logger.error(f"❌ Error vectorizing video {video_id}: {e}")
+                    continue
                 
-                if isinstance(transcript_data, list):
-                    for segment_index, segment in enumerate(transcript_data):
-                        if isinstance(segment, dict):
-                            text = segment.get('text', '')
-                            if text:
-                                # Generate embedding for this segment only
-                                embedding = await self.connections.generate_embedding(text)
-                                if embedding:
-                                    # Create vector ID for this segment (must be UUID)
-                                    vector_id = str(uuid.uuid4())
-                                    
-                                    # Prepare metadata for this transcript segment
-                                    segment_metadata = {
-                                        "video_id": video_id,
-                                        "segment_index": segment_index,
-                                        "text": text,
-                                        "start": segment.get('start', 0),
-                                        "end": segment.get('end', 0),
-                                        "duration": segment.get('duration', 0),
-                                        "url": video["url"],
-                                        "carousel_index": carousel_index,
-                                        "type": "transcript_segment",
-                                        "tags": [],  # Individual segments don't have tags
-                                        "created_at": str(video["created_at"]),
-                                        "vectorized_at": str(datetime.now())
-                                    }
-                                    
-                                    # Store transcript segment vector
-                                    success = await self.connections.store_vector(
-                                        collection_name=transcript_collection,
-                                        vector_id=vector_id,
-                                        embedding=embedding,
-                                        metadata=segment_metadata
-                                    )
-                                    
-                                    if success:
-                                        vectors_created += 1
-                                        vector_ids.append(vector_id)
-                                        logger.debug(f"✅ Created transcript segment vector {segment_index} for video {video_id}")
-                                    else:
-                                        logger.warning(f"⚠️ Failed to store transcript segment {segment_index} for video {video_id}")
-            
-            # Process scene descriptions individually  
-            if video.get("descriptions"):
-                descriptions_data = video["descriptions"]
-                if isinstance(descriptions_data, str):
-                    try:
-                        descriptions_data = json.loads(descriptions_data)
-                    except json.JSONDecodeError:
-                        descriptions_data = []
+                vectors_created = sum(len(points) for points in vectors.values())
+                if vectors_created == 0:
+                    logger.warning(f"⚠️ No vectors created for video {video_id} - no valid content found")
+                    continue
                 
-                if isinstance(descriptions_data, list):
-                    for scene_index, scene in enumerate(descriptions_data):
-                        if isinstance(scene, dict):
-                            # Try both field names for backward compatibility
-                            desc = scene.get('ai_description', '') or scene.get('description', '')
-                            if desc:
-                                # Generate embedding for this scene only
-                                embedding = await self.connections.generate_embedding(desc)
-                                if embedding:
-                                    # Create vector ID for this scene (must be UUID)
-                                    vector_id = str(uuid.uuid4())
-                                    
-                                    # Prepare metadata for this scene description
-                                    scene_metadata = {
-                                        "video_id": video_id,
-                                        "scene_index": scene_index,
-                                        "description": desc,
-                                        "start_time": scene.get('start_time', 0),
-                                        "end_time": scene.get('end_time', 0),
-                                        "duration": scene.get('duration', 0),
-                                        "frame_count": scene.get('frame_count', 0),
-                                        "url": video["url"],
-                                        "carousel_index": carousel_index,
-                                        "type": "scene_description",
-                                        "tags": scene.get('ai_tags', []) or scene.get('tags', []),
-                                        "created_at": str(video["created_at"]),
-                                        "vectorized_at": str(datetime.now())
-                                    }
-                                    
-                                    # Store scene description vector
-                                    success = await self.connections.store_vector(
-                                        collection_name=scene_collection,
-                                        vector_id=vector_id,
-                                        embedding=embedding,
-                                        metadata=scene_metadata
-                                    )
-                                    
-                                    if success:
-                                        vectors_created += 1
-                                        vector_ids.append(vector_id)
-                                        logger.debug(f"✅ Created scene description vector {scene_index} for video {video_id}")
-                                    else:
-                                        logger.warning(f"⚠️ Failed to store scene description {scene_index} for video {video_id}")
+                for collection_name, points in vectors.items():
+                    batch_vectors[collection_name].extend(points)
+                statuses.append((video_id, f"{vectors_created}_vectors"))
+                video_collections[video_id] = {name for name, points in vectors.items() if points}
+                logger.info(f"✅ Prepared {vectors_created} vectors for video {video_id} (carousel {video.get('carousel_index', 0)})")
+            
+            if not statuses:
+                return 0
             
-            # Check if we created any vectors
-            if vectors_created == 0:
-                logger.warning(f"⚠️ No vectors created for video {video_id} - no valid content found")
-                return False
+            # One round-trip per collection instead of one per vector
+            failed_collections = set()
+            for collection_name, points in batch_vectors.items():
+                if points and not await self.connections.store_vectors(collection_name, points):
+                    logger.error(f"❌ Failed to store batch of {len(statuses)} videos in {collection_name}")
+                    failed_collections.add(collection_name)
+            
+            statuses = [
+                (video_id, status) for video_id, status in statuses
+                if not video_collections[video_id] & failed_collections
+            ]
+            if not statuses:
+                return 0
             
             # Update PostgreSQL with vectorization info (store count instead of single ID)
-            await self.db.update_vectorization_status(video_id, f"{vectors_created}_vectors", "text-embedding-3-small")
-            logger.info(f"✅ Successfully vectorized video {video_id} (carousel {carousel_index}): {vectors_created} vectors created")
-            return True
+            if not await self.db.update_vectorization_status_many(statuses, "text-embedding-3-small"):
+                return 0
+            
+            return len(statuses)
                 
         except Exception as e:
-            logger.error(f"❌ Error vectorizing video {video_id}: {e}")
-            return False
+            logger.error(f"❌ Error vectorizing batch of {len(videos)} videos: {e}")
+            return 0
     
-    async def vectorize_all_unvectorized(self, limit: Optional[int] = None, dry_run: bool = False) -> Dict[str, Any]:
+    async def vectorize_all_unvectorized(self, limit: Optional[int] = None, dry_run: bool = False,
+                                         batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
         """
         Vectorize all unvectorized videos.
         
         Args:
             limit: Maximum number of videos to process
             dry_run: If True, only show what would be processed
+            batch_size: Number of videos written to Qdrant/PostgreSQL per round-trip
             
         Returns:
             Summary of the vectorization process
@@ -283,18 +334,15 @@ class VectorizeExistingVideos:
             successful = 0
             failed = 0
             
-            for i, video in enumerate(videos, 1):
-                logger.info(f"📹 Processing video {i}/{len(videos)}: {video['id']}")
+            for start in range(0, len(videos), batch_size):
+                batch = videos[start:start + batch_size]
+                logger.info(f"📹 Processing videos {start + 1}-{start + len(batch)}/{len(videos)}")
                 
-                success = await self.vectorize_video(video)
-                if success:
-                    successful += 1
-                else:
-                    failed += 1
+                batch_successful = await self.vectorize_batch(batch)
+                successful += batch_successful
+                failed += len(batch) - batch_successful
                 
-                # Progress update every 10 videos
-                if i % 10 == 0:
-                    logger.info(f"📊 Progress: {i}/{len(videos)} videos processed ({successful} successful, {failed} failed)")
+                logger.info(f"📊 Progress: {start + len(batch)}/{len(videos)} videos processed ({successful} successful, {failed} failed)")
             
             # Final summary
             logger.info(f"🎉 Vectorization complete!")
@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.admission import AdmissionController
+from app.main import admitted
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out_when_saturated():
+    """A full controller makes acquire() time out instead of admitting."""
+    controller = AdmissionController(2)
+    await controller.acquire()
+    await controller.acquire()
+    assert controller.locked()
+
+    with pytest.raises(asyncio.TimeoutError):
+        await controller.acquire(timeout=0.05)
+    assert controller.active == 2
+
+
+@pytest.mark.asyncio
+async def test_release_wakes_waiter():
+    """Releasing a slot lets a queued acquire() through."""
+    controller = AdmissionController(1)
+    await controller.acquire()
+
+    waiter = asyncio.create_task(controller.acquire(timeout=1))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    await controller.release()
+    await asyncio.wait_for(waiter, 1)
+    assert controller.active == 1
+
+
+@pytest.mark.asyncio
+async def test_raising_limit_admits_waiters():
+    """set_limit() with a higher limit admits waiters without a release."""
+    controller = AdmissionController(1)
+    await controller.acquire()
+    waiters = [asyncio.create_task(controller.acquire(timeout=1)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    await controller.set_limit(3)
+    await asyncio.wait_for(asyncio.gather(*waiters), 1)
+    assert controller.get_stats() == {"limit": 3, "active": 3, "saturated": True}
+
+
+@pytest.mark.asyncio
+async def test_lowering_limit_keeps_running_work():
+    """Lowering the limit holds back new work but never evicts active slots."""
+    controller = AdmissionController(3)
+    for _ in range(3):
+        await controller.acquire()
+
+    await controller.set_limit(1)
+    assert controller.active == 3
+    for _ in range(2):
+        await controller.release()
+    assert controller.locked()
+
+    await controller.release()
+    await controller.acquire(timeout=0.05)
+    assert controller.active == 1
+
+
+@pytest.mark.asyncio
+async def test_admitted_returns_503_when_busy():
+    """The endpoint helper turns an admission timeout into 503 with Retry-After."""
+    controller = AdmissionController(1)
+    async with admitted(controller):
+        with pytest.raises(HTTPException) as exc_info:
+            async with admitted(controller, timeout=0.01):
+                pass
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers == {"Retry-After": "5"}
+    assert controller.active == 0
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import app.main as main
+from app.main import ProcessRequest, VectorizeExistingRequest
+
+
+@pytest.fixture
+def vectorize_state(monkeypatch):
+    """Fresh job table and queue bound to the test's event loop."""
+    monkeypatch.setattr(main, "MAX_VECTORIZE_JOBS", 2)
+    monkeypatch.setattr(main, "vectorize_jobs", main.OrderedDict())
+    monkeypatch.setattr(main, "vectorize_queue", asyncio.Queue())
+
+
+async def _queue_job(job_id: str, request: VectorizeExistingRequest):
+    main.record_vectorize_job(job_id, {"job_id": job_id, "status": "queued"})
+    await main.vectorize_queue.put((job_id, request))
+
+
+@pytest.mark.asyncio
+async def test_vectorize_worker_survives_evicted_jobs(vectorize_state, monkeypatch):
+    """Jobs evicted from the status table while queued must not kill the worker."""
+    passes = []
+
+    async def fake_run_vectorization(request):
+        passes.append(request.limit)
+        return {"success": True, "limit": request.limit}
+
+    monkeypatch.setattr(main, "run_vectorization", fake_run_vectorization)
+
+    for index in range(4):
+        await _queue_job(f"job-{index}", VectorizeExistingRequest(limit=index, background=True))
+    assert list(main.vectorize_jobs) == ["job-2", "job-3"]
+
+    worker = asyncio.create_task(main.vectorize_worker())
+    try:
+        await asyncio.wait_for(main.vectorize_queue.join(), 1)
+        assert not worker.done()
+        assert sorted(passes) == [0, 1, 2, 3]
+        assert main.vectorize_jobs["job-3"]["status"] == "completed"
+
+        # The worker keeps serving jobs queued afterwards
+        await _queue_job("job-4", VectorizeExistingRequest(limit=4, background=True))
+        await asyncio.wait_for(main.vectorize_queue.join(), 1)
+        assert main.vectorize_jobs["job-4"]["result"] == {"success": True, "limit": 4}
+    finally:
+        worker.cancel()
+
+
+@pytest.mark.asyncio
+async def test_vectorize_worker_records_failures(vectorize_state, monkeypatch):
+    """A failed pass marks its job failed and the worker carries on."""
+    async def failing_run_vectorization(request):
+        raise RuntimeError("qdrant down")
+
+    monkeypatch.setattr(main, "run_vectorization", failing_run_vectorization)
+    await _queue_job("job-0", VectorizeExistingRequest(background=True))
+
+    worker = asyncio.create_task(main.vectorize_worker())
+    try:
+        await asyncio.wait_for(main.vectorize_queue.join(), 1)
+        assert main.vectorize_jobs["job-0"]["status"] == "failed"
+        assert "qdrant down" in main.vectorize_jobs["job-0"]["error"]
+        assert not worker.done()
+    finally:
+        worker.cancel()
+
+
+@pytest.fixture
+def process_state(monkeypatch):
+    """Fresh process job table and a one-slot queue bound to the test's event loop."""
+    monkeypatch.setattr(main, "MAX_PROCESS_JOBS", 2)
+    monkeypatch.setattr(main, "process_jobs", main.OrderedDict())
+    monkeypatch.setattr(main, "process_queue", asyncio.Queue(maxsize=1))
+
+
+@pytest.mark.asyncio
+async def test_background_process_queue_full_returns_503(process_state):
+    """background=true is refused with 503 once the queue is full instead of growing it."""
+    request = ProcessRequest(url="https://www.instagram.com/p/abc123/", include_base64=True, background=True)
+    response = await main.process_video(request, None)
+    assert response.status_code == 202
+
+    with pytest.raises(HTTPException) as exc_info:
+        await main.process_video(request, None)
+    assert exc_info.value.status_code == 503
+    assert "Retry-After" in exc_info.value.headers
+    assert len(main.process_jobs) == 1
+
+
+def test_unfinished_process_jobs_are_never_evicted(process_state):
+    """Only finished jobs are dropped to keep the table at MAX_PROCESS_JOBS."""
+    main.record_process_job("queued", {"status": "queued"})
+    main.record_process_job("running", {"status": "running"})
+    main.record_process_job("done-1", {"status": "completed"})
+    main.record_process_job("done-2", {"status": "failed"})
+    main.record_process_job("queued-2", {"status": "queued"})
+    assert list(main.process_jobs) == ["queued", "running", "queued-2"]
@@ -0,0 +1,119 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+import app.client_rate_limiter as client_rate_limiter
+import app.main as main
+from app.client_rate_limiter import ClientRateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for bucket refills."""
+    now = [1000.0]
+    monkeypatch.setattr(client_rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_burst_then_rejects(clock):
+    """A full bucket allows per_minute requests, then reports the wait."""
+    limiter = ClientRateLimiter("test", per_minute=2)
+    assert limiter.check("1.2.3.4") == 0
+    assert limiter.check("1.2.3.4") == 0
+
+    assert limiter.check("1.2.3.4") == pytest.approx(30.0)
+    assert limiter.get_stats()["rejected"] == 1
+
+
+def test_bucket_refills_over_time(clock):
+    """Tokens come back at per_minute / 60 per second."""
+    limiter = ClientRateLimiter("test", per_minute=2)
+    limiter.check("1.2.3.4")
+    limiter.check("1.2.3.4")
+
+    clock[0] += 29
+    assert limiter.check("1.2.3.4") > 0
+    clock[0] += 1
+    assert limiter.check("1.2.3.4") == 0
+
+
+def test_clients_have_separate_buckets(clock):
+    """One client's usage never spends another client's budget."""
+    limiter = ClientRateLimiter("test", per_minute=1)
+    assert limiter.check("1.1.1.1") == 0
+    assert limiter.check("1.1.1.1") > 0
+    assert limiter.check("2.2.2.2") == 0
+
+
+def test_idle_clients_are_pruned(clock):
+    """Buckets idle long enough to be full are dropped."""
+    limiter = ClientRateLimiter("test", per_minute=10)
+    limiter.check("old")
+    clock[0] += client_rate_limiter.BUCKET_IDLE_SECONDS
+    limiter.check("a")
+    limiter.check("b")
+    assert limiter.get_stats()["tracked_clients"] == 2
+
+
+def test_tracked_clients_are_capped(clock, monkeypatch):
+    """Past the cap the least recently seen client is evicted, even if not idle."""
+    monkeypatch.setattr(client_rate_limiter, "MAX_TRACKED_CLIENTS", 2)
+    limiter = ClientRateLimiter("test", per_minute=1)
+    limiter.check("a")
+    limiter.check("b")
+    limiter.check("a")  # "b" is now least recently seen
+    limiter.check("c")
+
+    assert limiter.get_stats()["tracked_clients"] == 2
+    assert limiter.check("a") > 0
+    assert limiter.check("b") == 0
+
+
+def _limited_app(name: str, per_minute: int) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(main.rate_limited(name, per_minute))])
+    async def limited():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_route_returns_429_with_retry_after(clock):
+    """Requests over budget get 429 and a whole-second Retry-After."""
+    client = _limited_app("test-route-429", per_minute=2)
+    assert client.get("/limited").status_code == 200
+    assert client.get("/limited").status_code == 200
+
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_route_limit_disabled_by_zero(clock):
+    """per_minute=0 turns the limit off."""
+    client = _limited_app("test-route-off", per_minute=0)
+    assert all(client.get("/limited").status_code == 200 for _ in range(5))
+
+
+def test_forwarded_header_keys_clients(clock, monkeypatch):
+    """With CLIENT_IP_HEADER set, clients are keyed on the address the trusted proxy appended."""
+    monkeypatch.setattr(main, "CLIENT_IP_HEADER", "X-Forwarded-For")
+    client = _limited_app("test-route-forwarded", per_minute=1)
+
+    assert client.get("/limited", headers={"X-Forwarded-For": "1.1.1.1"}).status_code == 200
+    # Spoofed entries to the left of the proxy's don't buy a fresh bucket
+    assert client.get("/limited", headers={"X-Forwarded-For": "9.9.9.9, 1.1.1.1"}).status_code == 429
+    assert client.get("/limited", headers={"X-Forwarded-For": "1.1.1.1, 2.2.2.2"}).status_code == 200
+
+
+def test_forwarded_header_trusted_hops(clock, monkeypatch):
+    """With two trusted proxies the client is the second entry from the right."""
+    monkeypatch.setattr(main, "CLIENT_IP_HEADER", "X-Forwarded-For")
+    monkeypatch.setattr(main, "TRUSTED_PROXY_HOPS", 2)
+    client = _limited_app("test-route-forwarded-hops", per_minute=1)
+
+    assert client.get("/limited", headers={"X-Forwarded-For": "9.9.9.9, 1.1.1.1, 10.0.0.1"}).status_code == 200
+    assert client.get("/limited", headers={"X-Forwarded-For": "8.8.8.8, 1.1.1.1, 10.0.0.2"}).status_code == 429
+    # A chain shorter than the trusted hops falls back to its first entry
+    assert client.get("/limited", headers={"X-Forwarded-For": "2.2.2.2"}).status_code == 200
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+
+import app.main as main
+from app.admission import AdmissionController
+from app.main import ProcessRequest
+from app.utils import run_blocking
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_blocking_waits_for_thread():
+    """Cancelling the caller only propagates once the worker thread has finished."""
+    release = threading.Event()
+    finished = []
+
+    def blocking_step():
+        release.wait(1)
+        finished.append(True)
+
+    task = asyncio.create_task(run_blocking(blocking_step))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.sleep(0.01)
+    assert not task.done()
+
+    release.set()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert finished == [True]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_process_run_keeps_slot_until_thread_finishes(monkeypatch):
+    """A cancelled /process run holds its admission slot while its thread is still working."""
+    controller = AdmissionController(1)
+    monkeypatch.setattr(main, "process_admission", lambda: controller)
+    release = threading.Event()
+
+    async def fake_pipeline(**kwargs):
+        await run_blocking(release.wait, 1)
+        return {"success": True, "videos": []}
+
+    monkeypatch.setattr(main, "process_video_unified_simple", fake_pipeline)
+    request = ProcessRequest(url="https://www.instagram.com/p/abc123/")
+    job = asyncio.create_task(main.run_process_job(request, str(request.url)))
+    await asyncio.sleep(0.01)
+    assert controller.active == 1
+
+    job.cancel()
+    await asyncio.sleep(0.01)
+    assert controller.active == 1
+
+    release.set()
+    with pytest.raises(asyncio.CancelledError):
+        await job
+    assert controller.active == 0
@@ -0,0 +1,55 @@
+import pytest
+
+import app.response_cache as response_cache
+from app.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for TTL checks."""
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    """Entries are served until the TTL passes, then dropped."""
+    cache = ResponseCache(ttl_seconds=10, max_entries=4)
+    cache.set(("video", "a"), {"success": True})
+
+    clock[0] += 9
+    assert cache.get(("video", "a")) == {"success": True}
+
+    clock[0] += 2
+    assert cache.get(("video", "a")) is None
+    assert cache.get_stats()["entries"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    """When full, the entry read least recently is evicted first."""
+    cache = ResponseCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_zero_size_cache_stores_nothing(clock):
+    """max_entries=0 disables caching."""
+    cache = ResponseCache(ttl_seconds=60, max_entries=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_clear_drops_all_entries(clock):
+    """clear() empties the cache after writes."""
+    cache = ResponseCache(ttl_seconds=60, max_entries=4)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.clear()
+    assert cache.get_stats()["entries"] == 0
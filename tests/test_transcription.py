@@ -0,0 +1,51 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app.transcription as transcription
+
+
+class FakeModel:
+    """Whisper stand-in that records how many transcriptions overlap."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def transcribe(self, audio_path):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return {"text": "hi", "segments": [{"start": 0.0, "end": 1.0, "text": "hi"}]}
+
+
+@pytest.fixture
+def fake_whisper(monkeypatch):
+    loads = []
+    model = FakeModel()
+
+    def load_model(model_size):
+        loads.append(model_size)
+        return model
+
+    monkeypatch.setattr(transcription.whisper, "load_model", load_model)
+    monkeypatch.setattr(transcription, "_whisper_models", {})
+    monkeypatch.setattr(transcription, "_check_audio_stream", lambda path: True)
+    return loads, model
+
+
+def test_parallel_transcriptions_share_one_model(fake_whisper):
+    """Concurrent carousel videos load Whisper once and transcribe one at a time."""
+    loads, model = fake_whisper
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(transcription.transcribe_audio, ["a.mp4", "b.mp4", "c.mp4", "d.mp4"]))
+
+    assert loads == ["base"]
+    assert model.peak == 1
+    assert all(segments == [{"start": 0.0, "end": 1.0, "text": "hi"}] for segments in results)
@@ -12,6 +12,7 @@ Options:
     --limit N    : Only process N videos (default: no limit)
     --dry-run    : Show what would be processed without actually doing it
     --verbose    : Show detailed logging
+    --batch-size : Videos written per round-trip (default: 64)
 """
 
 import asyncio
@@ -34,6 +35,7 @@ async def main():
     parser.add_argument("--limit", type=int, help="Maximum number of videos to process")
     parser.add_argument("--dry-run", action="store_true", help="Show what would be processed without actually doing it")
     parser.add_argument("--verbose", action="store_true", help="Show detailed logging")
+    parser.add_argument("--batch-size", type=int, default=64, help="Videos written to Qdrant/PostgreSQL per round-trip")
     
     args = parser.parse_args()
     
@@ -49,7 +51,8 @@ async def main():
         # Run vectorization
         result = await vectorizer.vectorize_all_unvectorized(
             limit=args.limit,
-            dry_run=args.dry_run
+            dry_run=args.dry_run,
+            batch_size=args.batch_size
         )
         
         # Print final result